@@ -2,24 +2,25 @@
 import streamlit as st
 import os
 import sys
-from dotenv import load_dotenv
+import time
 
 # --- Imports are updated with new module names ---
 from src.logger import logger
 from src.exception import CustomException
-from src.utils import load_config, load_css
+from src.utils import get_config, load_env, get_style_tag
+from src.mvp.segment import count_words
 
-# --- This is the main import update ---
-from src.mvp.processor import ParaGlowProcessor
+# ParaGlowProcessor is imported inside get_pipeline() so the first paint
+# doesn't wait on the backend clients' imports.
 
 # -------------------------
 # Load Config & Env
 # -------------------------
 logger.info("Application starting...")
 try:
-    # Load config from config.yaml
-    config = load_config()
-    load_dotenv() # Load keys from .env
+    # Load config from config.yaml (parsed once per process, shared with the logger)
+    config = get_config()
+    load_env() # Load keys from .env (once per process)
 
     HF_API_KEY = os.getenv("HF_API_KEY")
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -27,6 +28,12 @@ try:
     # Get the CSS file path from our config
     CSS_PATH = config['artifacts']['style_css_path']
 
+    # Stream paraphrase tokens into the output panel as they arrive
+    STREAM_PARAPHRASE = config.get('paraphrase', {}).get('stream', True)
+
+    # Seconds between progress refreshes of a running background summary
+    JOB_POLL_INTERVAL = (config.get('jobs') or {}).get('poll_interval', 1.0)
+
 except Exception as e:
     # Use our new custom exception for error logging
     raise CustomException(e, sys)
@@ -46,7 +53,7 @@ st.set_page_config(
 # -------------------------
 try:
     # Load the external CSS file using our util function
-    st.markdown(f"<style>{load_css(CSS_PATH)}</style>", unsafe_allow_html=True)
+    st.markdown(get_style_tag(CSS_PATH), unsafe_allow_html=True)
     logger.info("Custom CSS loaded successfully.")
 except Exception as e:
     logger.error(f"Error loading CSS: {e}")
@@ -59,6 +66,7 @@ except Exception as e:
 def get_pipeline():
     logger.info("Attempting to load ParaGlowProcessor...")
     # --- Use the new class name ---
+    from src.mvp.processor import ParaGlowProcessor
     return ParaGlowProcessor()
 
 # If API key missing -> stop
@@ -83,6 +91,73 @@ except Exception as e:
     CustomException(e, sys)
     st.error(f"Failed to initialize ParaGlowProcessor. Check logs for details.")
 
+# -------------------------
+# Helper: background summary jobs
+# -------------------------
+def active_job():
+    """
+    The job this session is waiting on (None if none, or it expired).
+    Jobs live in the cached pipeline, so they outlive reruns and sessions.
+    """
+    job_id = st.session_state.get('job_id')
+    if not job_id or not pipeline_ready:
+        return None
+    job = pipeline.jobs.get(job_id)
+    if job is None:
+        st.session_state.job_id = None
+    return job
+
+def show_failure(result, failed=False, fallback="The request failed. Check logs for details."):
+    """
+    Shows an error result (⚠️/❌ prefix, empty, or failed) instead of output.
+    Returns True if it was one.
+    """
+    if not failed and result.strip() and not result.startswith(("⚠️", "❌")):
+        return False
+    # ⚠️ = input or upstream not ready (e.g. model loading), ❌ = error
+    if result.startswith("⚠️"):
+        st.warning(result)
+    else:
+        st.error(result or fallback)
+    st.session_state.output_text = ""
+    return True
+
+def collect_job(job):
+    """
+    Moves a finished job's result into the output panel.
+    """
+    st.session_state.job_id = None
+    result = job.result or ""
+    run_ms = job.to_dict()['run_ms'] or 0
+    if show_failure(result, failed=job.status == job.FAILED, fallback="The summary job failed. Check logs for details."):
+        logger.warning(f"[{job.request_id}] Summary job {job.id} {job.status} in {run_ms:.0f} ms: {result}")
+        return
+    st.session_state.output_text = f"✅ Summary generated successfully!\n\n{result}"
+    pages = job.details.get('pages')
+    if pages: # Uploaded document: show how long page extraction took
+        slowest = max(pages, key=lambda page: page['parse_ms'])
+        st.session_state.latency_caption = (
+            f"📄 {len(pages)} pages parsed in {sum(page['parse_ms'] for page in pages):.0f} ms · "
+            f"slowest p.{slowest['page']} ({slowest['parse_ms']:.0f} ms)"
+        )
+    logger.info(f"[{job.request_id}] Summary job {job.id} {job.status} in {run_ms:.0f} ms.")
+
+def job_progress():
+    """
+    Progress bar for the running job. Re-run on its own every JOB_POLL_INTERVAL
+    seconds where st.fragment exists; triggers a full rerun once the job is done.
+    """
+    job = active_job()
+    if job is None:
+        return
+    if job.is_finished:
+        st.rerun()
+    chunks = f" ({job.done}/{job.total} chunks)" if job.total > 1 else ""
+    st.progress(job.fraction, text=f"🔮 Generating your summary...{chunks}")
+
+if hasattr(st, "fragment"):
+    job_progress = st.fragment(run_every=JOB_POLL_INTERVAL)(job_progress)
+
 # -------------------------
 # Modern Header
 # -------------------------
@@ -120,12 +195,19 @@ with col1:
         label_visibility="collapsed"
     )
 
+    # --- Document upload: parsed page by page while summarization runs ---
+    uploaded_file = st.file_uploader(
+        "Or upload a document",
+        type=["pdf", "docx", "txt", "md"],
+        help="While a file is attached, Summarize uses it instead of the text box. Paraphrase always uses the text box.",
+    )
+
     # --- NEW: LIVE ANALYTICS DASHBOARD ---
     st.markdown("<div style='height: 10px'></div>", unsafe_allow_html=True)
 
     # --- CHANGED: Updated Reading Time Logic ---
     if input_text:
-        word_count = len(input_text.split())
+        word_count = count_words(input_text)
         char_count = len(input_text)
         
         # Calculate reading time in minutes (as a float)
@@ -185,6 +267,11 @@ with col2:
         st.session_state.output_text = ""
     if 'last_triggered' not in st.session_state: # Track which button caused the output
          st.session_state.last_triggered = ""
+    if 'latency_caption' not in st.session_state: # Streaming latency (TTFT / total) of the last paraphrase
+         st.session_state.latency_caption = ""
+    if 'job_id' not in st.session_state: # Background summary job this session is waiting on
+         # A new session (e.g. page refresh) picks the job back up from the URL
+         st.session_state.job_id = st.query_params.get("job") if hasattr(st, "query_params") else None
 
     # Check which button was pressed (ensure correct indentation here)
     method = st.session_state.get('summarization_method', 'Abstractive') # Get sidebar value safely
@@ -193,12 +280,14 @@ with col2:
     if summarize_btn:
         st.session_state.last_action = 'summarize'
         st.session_state.last_triggered = 'summarize' # Record button press
+        st.session_state.latency_caption = ""
     if paraphrase_btn:
         st.session_state.last_action = 'paraphrase'
         st.session_state.last_triggered = 'paraphrase' # Record button press
+        st.session_state.latency_caption = ""
 
     # Process based on last action and input text
-    if not input_text:
+    if not input_text and uploaded_file is None:
         st.info("👈 Enter text in the input panel and select an action")
         st.session_state.output_text = "" # Clear output if input is empty
     elif st.session_state.last_action: # Only process if an action was triggered *this run*
@@ -207,37 +296,102 @@ with col2:
             if not pipeline_ready:
                 st.error("Summarization backend not available. Check API key and pipeline logs.")
                 st.session_state.output_text = ""
+            elif uploaded_file is not None:
+                try:
+                    ctx = pipeline.start_trace("summarize_document", method=method.lower(), length=length.lower(),
+                                               file=uploaded_file.name, bytes=uploaded_file.size)
+                    # Pages are extracted on the ingest pool and summarized as they arrive
+                    job_id = pipeline.submit_document(uploaded_file.getvalue(), uploaded_file.name,
+                                                      method=method.lower(), length=length.lower(), ctx=ctx)
+                    st.session_state.job_id = job_id
+                    if hasattr(st, "query_params"):
+                        st.query_params["job"] = job_id
+                    st.session_state.output_text = ""
+                    logger.info(f"[{ctx.request_id}] Document job {job_id} submitted for {uploaded_file.name}. Method: {method}, Length: {length}")
+                except Exception as e:
+                    CustomException(e, sys)
+                    st.error("An error occurred while reading the document. Check logs for details.")
+                    st.session_state.output_text = ""
             else:
-                with st.spinner("🔮 Generating your summary..."):
-                    try:
-                        logger.info(f"Generating summary. Method: {method}, Length: {length}")
-                        summary = pipeline.summarize(input_text, method=method.lower(), length=length.lower())
-                        st.session_state.output_text = f"✅ Summary generated successfully!\n\n{summary}" # Store result with success message
-                        logger.info("Summary generated.")
-                    except Exception as e:
-                        CustomException(e, sys)
-                        st.error("An error occurred while generating the summary. Check logs for details.")
-                        st.session_state.output_text = ""
+                try:
+                    # One trace per action; its request_id ties these lines to the JSON span log
+                    ctx = pipeline.start_trace("summarize", method=method.lower(), length=length.lower(), chars=len(input_text))
+                    # Runs on the job pool; this script run only polls, so reruns don't lose the result
+                    job_id = pipeline.submit_summarize(input_text, method=method.lower(), length=length.lower(), ctx=ctx)
+                    st.session_state.job_id = job_id
+                    if hasattr(st, "query_params"):
+                        st.query_params["job"] = job_id
+                    st.session_state.output_text = ""
+                    logger.info(f"[{ctx.request_id}] Summary job {job_id} submitted. Method: {method}, Length: {length}")
+                except Exception as e:
+                    CustomException(e, sys)
+                    st.error("An error occurred while generating the summary. Check logs for details.")
+                    st.session_state.output_text = ""
 
         elif action == 'paraphrase':
-            if not pipeline_ready or pipeline.paraphraser is None: # Check if paraphraser is loaded
+            if not input_text:
+                st.warning("Paraphrasing works on the text box. Paste the passage you want rewritten.")
+                st.session_state.output_text = ""
+            elif not pipeline_ready or pipeline.paraphraser is None: # Check if paraphraser is loaded
                 st.error("Paraphrase backend not available. Check API key and pipeline logs.")
                 st.session_state.output_text = ""
             else:
-                with st.spinner("🔮 Paraphrasing your text..."):
+                if STREAM_PARAPHRASE:
+                    # Render tokens as they arrive instead of waiting behind a spinner
                     try:
-                        logger.info("Generating paraphrase...")
-                        paraphrased = pipeline.paraphrase(input_text)
-                        st.session_state.output_text = f"✅ Paraphrase completed successfully!\n\n{paraphrased}" # Store result with success message
-                        logger.info("Paraphrase generated.")
+                        ctx = pipeline.start_trace("stream_paraphrase", chars=len(input_text))
+                        logger.info(f"[{ctx.request_id}] Streaming paraphrase...")
+                        stream_stats = {}
+                        live_output = st.empty()
+                        streamed = ""
+                        for delta in pipeline.stream_paraphrase(input_text, stats=stream_stats, ctx=ctx):
+                            streamed += delta
+                            live_output.markdown(streamed + " ▌")
+                        live_output.empty()
+                        paraphrased = stream_stats.get("result", streamed)
+                        if show_failure(paraphrased):
+                            logger.warning(f"[{ctx.request_id}] Paraphrase failed: {paraphrased}")
+                        else:
+                            st.session_state.output_text = f"✅ Paraphrase completed successfully!\n\n{paraphrased}"
+                            st.session_state.latency_caption = (
+                                f"⚡ First token in {stream_stats.get('ttft_ms', 0):.0f} ms · "
+                                f"total {stream_stats.get('total_ms', 0):.0f} ms"
+                            )
+                            logger.info(
+                                f"[{ctx.request_id}] Paraphrase streamed. TTFT: {stream_stats.get('ttft_ms', 0):.0f} ms, "
+                                f"Total: {stream_stats.get('total_ms', 0):.0f} ms"
+                            )
                     except Exception as e:
                         CustomException(e, sys)
                         st.error("An error occurred while paraphrasing. Check logs for details.")
                         st.session_state.output_text = ""
+                else:
+                    with st.spinner("🔮 Paraphrasing your text..."):
+                        try:
+                            ctx = pipeline.start_trace("paraphrase", chars=len(input_text))
+                            logger.info(f"[{ctx.request_id}] Generating paraphrase...")
+                            paraphrased = pipeline.paraphrase(input_text, ctx=ctx)
+                            if show_failure(paraphrased):
+                                logger.warning(f"[{ctx.request_id}] Paraphrase failed: {paraphrased}")
+                            else:
+                                st.session_state.output_text = f"✅ Paraphrase completed successfully!\n\n{paraphrased}" # Store result with success message
+                                logger.info(f"[{ctx.request_id}] Paraphrase generated in {ctx.duration_ms:.0f} ms.")
+                        except Exception as e:
+                            CustomException(e, sys)
+                            st.error("An error occurred while paraphrasing. Check logs for details.")
+                            st.session_state.output_text = ""
 
         # Reset last action after processing to prevent re-running on refresh
         st.session_state.last_action = None
 
+    # Background summary: show its result once finished, otherwise poll its progress
+    job = active_job()
+    if job is not None and job.is_finished:
+        collect_job(job)
+        job = None
+    if job is not None:
+        job_progress()
+
     # Display the stored output text (or initial message)
     if st.session_state.output_text:
         is_success = st.session_state.output_text.startswith("✅")
@@ -252,6 +406,9 @@ with col2:
 
         st.text_area("output_display", value=output_display, height=350, label_visibility="collapsed", key="output_area") # Use key to prevent rerender issues
 
+        if st.session_state.latency_caption:
+            st.caption(st.session_state.latency_caption)
+
         # Only show download button if there's actual text content
         if output_display:
             st.download_button(
@@ -262,7 +419,7 @@ with col2:
                  use_container_width=True
              )
     # If no output and no input, show the initial message
-    elif not input_text:
+    elif not input_text and uploaded_file is None:
         st.info("👈 Enter text in the input panel and select an action")
 
 
@@ -336,4 +493,12 @@ st.markdown(
     </div>
     """,
     unsafe_allow_html=True,
-)
\ No newline at end of file
+)
+
+# -------------------------
+# Job polling fallback
+# -------------------------
+# Without st.fragment, poll by rerunning the whole (cheap) script after the page is drawn
+if job is not None and not hasattr(st, "fragment"):
+    time.sleep(JOB_POLL_INTERVAL)
+    st.rerun()
@@ -0,0 +1,204 @@
+# benchmarks/mock_server.py
+"""
+Local stand-in for the upstream APIs used by ParaGlow, so benchmarks run
+offline without spending API quota.
+
+Mimics:
+  - Hugging Face inference:  POST /models/<org>/<model>
+  - Groq chat completions:   POST /openai/v1/chat/completions  (incl. stream: true)
+
+Latency is drawn from a configurable distribution and 503/429 responses
+can be injected at fixed rates.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class LatencyModel:
+    """
+    Samples upstream latency in seconds.
+    kind: 'fixed' (median), 'uniform' (low..high) or 'lognormal' (median, sigma).
+    """
+
+    def __init__(self, kind="lognormal", median=0.2, sigma=0.5, low=0.05, high=0.5):
+        self.kind = kind
+        self.median = median
+        self.sigma = sigma
+        self.low = low
+        self.high = high
+
+    def sample(self):
+        if self.kind == "fixed":
+            return self.median
+        if self.kind == "uniform":
+            return random.uniform(self.low, self.high)
+        return random.lognormvariate(math.log(self.median), self.sigma)
+
+
+class MockUpstreamConfig:
+    """
+    Behavior knobs shared by all handler threads.
+    """
+
+    def __init__(self, latency=None, error_503_rate=0.0, error_429_rate=0.0,
+                 estimated_time=0.2, retry_after=0.2, stream_chunk_delay=0.002):
+        self.latency = latency or LatencyModel()
+        self.error_503_rate = error_503_rate
+        self.error_429_rate = error_429_rate
+        self.estimated_time = estimated_time
+        self.retry_after = retry_after
+        self.stream_chunk_delay = stream_chunk_delay
+
+        self.requests = 0
+        self.injected_503 = 0
+        self.injected_429 = 0
+        self._lock = threading.Lock()
+
+    def count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+class MockUpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real upstreams
+    # Headers and body go out as separate writes; without TCP_NODELAY every
+    # keep-alive request waits ~40 ms on Nagle + delayed ACK
+    disable_nagle_algorithm = True
+    config = MockUpstreamConfig()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+        if len(raw) < length:
+            # Client went away mid-request (e.g. a cancelled hedge)
+            self.close_connection = True
+            return
+        body = json.loads(raw or b"{}")
+        self.config.count("requests")
+
+        roll = random.random()
+        if roll < self.config.error_503_rate:
+            self.config.count("injected_503")
+            return self._send_json(503, {"error": "Model is currently loading", "estimated_time": self.config.estimated_time})
+        if roll < self.config.error_503_rate + self.config.error_429_rate:
+            self.config.count("injected_429")
+            return self._send_json(429, {"error": "Rate limit reached"}, {"Retry-After": str(self.config.retry_after)})
+
+        time.sleep(self.config.latency.sample())
+
+        if self.path.startswith("/models/"):
+            return self._huggingface(body)
+        if self.path.endswith("/chat/completions"):
+            return self._groq(body)
+        return self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def _huggingface(self, body):
+        words = str(body.get("inputs", "")).split()
+        max_words = int(body.get("parameters", {}).get("max_length", 130) / 1.3)
+        summary = " ".join(words[:max_words]) or "Empty input."
+        self._send_json(200, [{"summary_text": summary}])
+
+    def _groq(self, body):
+        prompt = body["messages"][-1]["content"]
+        source = prompt.split("\n\n", 1)[-1]
+        variants = [f"Variant {i}: {source}" for i in range(1, 4)]
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps({"variants": variants})
+        else:
+            content = "\n".join(variants)
+        usage = {
+            "prompt_tokens": len(prompt.split()),
+            "completion_tokens": len(content.split()),
+            "total_tokens": len(prompt.split()) + len(content.split()),
+        }
+
+        if not body.get("stream"):
+            return self._send_json(200, {"choices": [{"message": {"role": "assistant", "content": content}}], "usage": usage})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in content.split(" "):
+            self._write_chunk({"choices": [{"delta": {"content": token + " "}}]})
+            time.sleep(self.config.stream_chunk_delay)
+        self._write_chunk({"choices": [{"delta": {}, "finish_reason": "stop"}], "x_groq": {"usage": usage}})
+        self._write_raw(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, payload):
+        self._write_raw(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+    def _write_raw(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockUpstreamServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs when many pooled connections open at once
+    request_queue_size = 256
+
+    def handle_error(self, request, client_address):
+        # Pooled clients drop idle keep-alive sockets; that is expected, not an error
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+def start_mock_server(config=None, host="127.0.0.1", port=0):
+    """
+    Starts the mock upstream in a background thread.
+
+    Returns:
+        (server, base_url): call server.shutdown() when done
+    """
+    handler = type("ConfiguredMockUpstreamHandler", (MockUpstreamHandler,), {"config": config or MockUpstreamConfig()})
+    server = MockUpstreamServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the mock HF/Groq upstream server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--median", type=float, default=0.2, help="Median latency in seconds")
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--error-503-rate", type=float, default=0.0)
+    parser.add_argument("--error-429-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = MockUpstreamConfig(
+        latency=LatencyModel(args.latency, median=args.median, sigma=args.sigma),
+        error_503_rate=args.error_503_rate,
+        error_429_rate=args.error_429_rate,
+    )
+    server, base_url = start_mock_server(config, port=args.port)
+    print(f"🧪 Mock upstream listening on {base_url} (Ctrl+C to stop)")
+    print(f"   huggingface_base_url: {base_url}/models")
+    print(f"   groq_api_url:         {base_url}/openai/v1/chat/completions")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,250 @@
+# benchmarks/run_benchmarks.py
+"""
+Offline load benchmark for ParaGlowProcessor.
+
+Starts the local mock upstream, drives summarize/paraphrase at fixed
+concurrency levels and reports throughput and p50/p95/p99 latency.
+Results are written as JSON so runs can be compared between commits.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --concurrency 1 8 32 --requests 200 --error-503-rate 0.05
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+# Make the project root importable when run as a script
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.mock_server import LatencyModel, MockUpstreamConfig, start_mock_server
+from src.mvp.processor import ParaGlowProcessor
+
+OPERATIONS = ("summarize", "paraphrase", "stream_paraphrase")
+
+SAMPLE_TEXT = (
+    "Artificial Intelligence is transforming industries by automating repetitive tasks, "
+    "improving efficiency, and enabling better decision-making across sectors such as "
+    "healthcare, finance, and transportation. "
+)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def build_processor(base_url):
+    """
+    Processor pointed at the mock upstream with caching off and limits opened up,
+    so every request exercises the full upstream path.
+    """
+    os.environ.setdefault("HF_API_KEY", "benchmark")
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    config = {
+        "endpoints": {
+            "huggingface_base_url": f"{base_url}/models",
+            "groq_api_url": f"{base_url}/openai/v1/chat/completions",
+        },
+        "transport": {"pool_size": 64, "async_concurrency": {"huggingface": 64, "groq": 64}},
+        "cache": {"enabled": False},
+        "summarization": {"incremental": False},
+        "retry": {"base_delay": 0.05, "max_delay": 1, "deadline": 30},
+        "groq": {"rate_limit": {"requests_per_minute": 10 ** 6, "tokens_per_minute": 10 ** 9}},
+    }
+    return ParaGlowProcessor(config)
+
+
+def run_one(processor, operation, text):
+    started = time.perf_counter()
+    if operation == "summarize":
+        result = processor.summarize(text, method="abstractive", length="medium")
+    elif operation == "paraphrase":
+        result = processor.paraphrase(text)
+    else:
+        stats = {}
+        for _ in processor.stream_paraphrase(text, stats=stats):
+            pass
+        result = stats.get("result", "")
+    return time.perf_counter() - started, result.startswith(("⚠️", "❌"))
+
+
+def run_level_sync(processor, operation, concurrency, total_requests, run_id):
+    # Unique inputs so neither the cache nor single-flight hides upstream work
+    texts = [f"[{run_id}-{operation}-{concurrency}-{i}] {SAMPLE_TEXT}" for i in range(total_requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda text: run_one(processor, operation, text), texts))
+    return outcomes, time.perf_counter() - started
+
+
+def run_level_async(processor, operation, concurrency, total_requests, run_id):
+    texts = [f"[{run_id}-{operation}-{concurrency}-{i}] {SAMPLE_TEXT}" for i in range(total_requests)]
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(text):
+            async with semaphore:
+                started = time.perf_counter()
+                if operation == "summarize":
+                    result = await processor.asummarize(text, method="abstractive", length="medium")
+                else:
+                    result = await processor.aparaphrase(text)
+                return time.perf_counter() - started, result.startswith(("⚠️", "❌"))
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(one(text) for text in texts))
+        await processor.async_transport.aclose()
+        return outcomes, time.perf_counter() - started
+
+    return asyncio.run(main())
+
+
+def summarize_level(operation, mode, concurrency, outcomes, elapsed):
+    latencies = sorted(latency for latency, _ in outcomes)
+    errors = sum(1 for _, failed in outcomes if failed)
+    return {
+        "operation": operation,
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": len(outcomes),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(len(outcomes) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path):
+    """
+    Prints p95/throughput deltas against a previous results file.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r["operation"], r["mode"], r["concurrency"]): r for r in baseline["results"]}
+
+    print(f"\n📊 Compared with {baseline_path} (commit {baseline.get('commit')}):")
+    for result in results:
+        old = previous.get((result["operation"], result["mode"], result["concurrency"]))
+        if not old:
+            continue
+        p95_delta = (result["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        rps_delta = (result["throughput_rps"] - old["throughput_rps"]) / old["throughput_rps"] * 100 if old["throughput_rps"] else 0.0
+        print(
+            f"  {result['operation']:<18} {result['mode']:<5} c={result['concurrency']:<4} "
+            f"p95 {p95_delta:+6.1f}%   throughput {rps_delta:+6.1f}%"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline ParaGlow benchmark against a mock upstream.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=100, help="Requests per concurrency level")
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="sync")
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--median", type=float, default=0.1, help="Median upstream latency in seconds")
+    parser.add_argument("--sigma", type=float, default=0.4, help="Lognormal spread")
+    parser.add_argument("--error-503-rate", type=float, default=0.0)
+    parser.add_argument("--error-429-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Results JSON path (default: benchmarks/results/)")
+    parser.add_argument("--compare", default=None, help="Previous results JSON to diff against")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        import random
+        random.seed(args.seed)
+
+    mock_config = MockUpstreamConfig(
+        latency=LatencyModel(args.latency, median=args.median, sigma=args.sigma),
+        error_503_rate=args.error_503_rate,
+        error_429_rate=args.error_429_rate,
+        estimated_time=0.1,
+        retry_after=0.1,
+    )
+    server, base_url = start_mock_server(mock_config)
+    print(f"🧪 Mock upstream on {base_url}")
+
+    processor = build_processor(base_url)
+    run_id = int(time.time())
+    modes = ["sync", "async"] if args.mode == "both" else [args.mode]
+
+    results = []
+    try:
+        for mode in modes:
+            for operation in args.operations:
+                if mode == "async" and operation == "stream_paraphrase":
+                    continue
+                for concurrency in args.concurrency:
+                    if mode == "sync":
+                        outcomes, elapsed = run_level_sync(processor, operation, concurrency, args.requests, run_id)
+                    else:
+                        outcomes, elapsed = run_level_async(processor, operation, concurrency, args.requests, run_id)
+                    result = summarize_level(operation, mode, concurrency, outcomes, elapsed)
+                    results.append(result)
+                    print(
+                        f"  {operation:<18} {mode:<5} c={concurrency:<4} "
+                        f"{result['throughput_rps']:>8.1f} req/s   p50 {result['p50_ms']:>8.1f} ms   "
+                        f"p95 {result['p95_ms']:>8.1f} ms   p99 {result['p99_ms']:>8.1f} ms   errors {result['errors']}"
+                    )
+    finally:
+        server.shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "settings": {
+            "requests_per_level": args.requests,
+            "latency": {"kind": args.latency, "median_s": args.median, "sigma": args.sigma},
+            "error_503_rate": args.error_503_rate,
+            "error_429_rate": args.error_429_rate,
+        },
+        "upstream": {
+            "requests": mock_config.requests,
+            "injected_503": mock_config.injected_503,
+            "injected_429": mock_config.injected_429,
+        },
+        "results": results,
+    }
+
+    output = args.output
+    if output is None:
+        results_dir = os.path.join(project_root, "benchmarks", "results")
+        os.makedirs(results_dir, exist_ok=True)
+        output = os.path.join(results_dir, f"bench-{report['commit'] or 'nogit'}-{run_id}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
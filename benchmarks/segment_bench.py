@@ -0,0 +1,145 @@
+# benchmarks/segment_bench.py
+"""
+Throughput (MB/s) of the text segmentation / normalization helpers on large inputs.
+
+Measures, on a generated corpus (or a file you pass in):
+  - sentence_spans      : boundary offsets only
+  - split_sentences     : offsets plus one string per sentence
+  - chunk_text          : sentence packing for the summarizer's map stage
+  - normalize_whitespace: cache-key normalization
+  - count_words         : the UI word count
+  - legacy_split        : the previous single-regex splitter, for comparison
+
+The generated text mixes the cases the segmenter handles (abbreviations,
+initials, decimals, quoted speech, bullet lists, paragraphs). A threshold
+turns it into a regression check (exit code 1 when exceeded).
+
+Usage:
+    python benchmarks/segment_bench.py --mb 16
+    python benchmarks/segment_bench.py --input corpus.txt --min-mbps 10
+"""
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+# Make the project root importable when run as a script
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.mvp.chunker import chunk_text
+from src.mvp.segment import count_words, normalize_whitespace, sentence_spans, split_sentences
+
+# Splitter used before src/mvp/segment.py (no abbreviation/decimal/bullet handling)
+_LEGACY_RE = re.compile(r"(?<=[.!?])[\"')\]]?\s+")
+
+WORDS = (
+    "the model reads long documents and writes short summaries for busy readers every day while "
+    "analysts compare quarterly results across regions teams markets products and customers"
+).split()
+TEMPLATES = (
+    "{s}.",
+    "Dr. Smith noted that {s}.",
+    "Revenue grew 3.75% to $12.4 million, e.g. in the U.S. market, as {s}.",
+    "Mr. J. R. Tolkien said {s}.",
+    "\"{s}!\" she said, and {s}.",
+    "Why would {s}?",
+    "{s} (see fig. 2).",
+    "Sales rose in Jan. and {s}.",
+)
+
+
+def generate(size_bytes, seed=0):
+    """
+    Synthetic prose of about size_bytes, with paragraphs and bullet/numbered lists.
+    """
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < size_bytes:
+        if rng.random() < 0.05:
+            numbered = rng.random() < 0.5
+            block = "Key points:\n" + "\n".join(
+                f"{f'{i}.' if numbered else '-'} {' '.join(rng.choices(WORDS, k=rng.randint(4, 10))).capitalize()}."
+                for i in range(1, rng.randint(3, 6))
+            )
+        else:
+            block = " ".join(
+                rng.choice(TEMPLATES).format(s=" ".join(rng.choices(WORDS, k=rng.randint(6, 18))))
+                for _ in range(rng.randint(3, 8))
+            )
+        parts.append(block)
+        size += len(block) + 2
+    return "\n\n".join(parts)
+
+
+def measure(fn, text, runs):
+    """
+    Median seconds over `runs` calls.
+    """
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure segmentation/normalization throughput.")
+    parser.add_argument("--mb", type=float, default=16, help="Size of the generated input")
+    parser.add_argument("--input", default=None, help="Benchmark this UTF-8 text file instead")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--chunk-tokens", type=int, default=900)
+    parser.add_argument("--min-mbps", type=float, default=None, help="Fail if sentence_spans is slower than this")
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            text = f.read()
+    else:
+        text = generate(int(args.mb * 1024 * 1024))
+    megabytes = len(text.encode("utf-8")) / (1024 * 1024)
+
+    cases = {
+        "sentence_spans": sentence_spans,
+        "split_sentences": split_sentences,
+        "chunk_text": lambda t: chunk_text(t, args.chunk_tokens),
+        "normalize_whitespace": normalize_whitespace,
+        "count_words": count_words,
+        "legacy_split": _LEGACY_RE.split,
+    }
+    print(f"📏 {megabytes:.1f} MB, {len(sentence_spans(text))} sentences, median of {args.runs} runs:")
+    results = {}
+    for name, fn in cases.items():
+        seconds = measure(fn, text, args.runs)
+        results[name] = {"seconds": round(seconds, 4), "mb_per_s": round(megabytes / seconds, 1)}
+        print(f"   {name:<21}: {megabytes / seconds:8.1f} MB/s  ({seconds * 1000:8.1f} ms)")
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "input": args.input or f"generated:{args.mb}MB",
+        "megabytes": round(megabytes, 2),
+        "runs": args.runs,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    spans_mbps = results["sentence_spans"]["mb_per_s"]
+    if args.min_mbps is not None and spans_mbps < args.min_mbps:
+        print(f"❌ sentence_spans at {spans_mbps} MB/s is below {args.min_mbps} MB/s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
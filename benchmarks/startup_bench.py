@@ -0,0 +1,123 @@
+# benchmarks/startup_bench.py
+"""
+Cold-start measurement for ParaGlow.
+
+Each run starts a fresh interpreter and records:
+  - import time of the modules app.py loads before the first paint
+  - ParaGlowProcessor() construction time
+  - first-use build time of each lazily created component
+
+Thresholds turn it into a regression check (exit code 1 when exceeded).
+
+Usage:
+    python benchmarks/startup_bench.py --runs 5
+    python benchmarks/startup_bench.py --max-import-ms 150 --max-init-ms 50
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside a fresh interpreter; prints one JSON line with the measurements
+PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import src.logger, src.exception, src.utils
+import src.mvp.processor
+t1 = time.perf_counter()
+from src.mvp.processor import ParaGlowProcessor
+processor = ParaGlowProcessor(src.utils.get_config())
+t2 = time.perf_counter()
+first_use = processor.warm_up()
+first_use.pop("init", None)
+print("STARTUP_JSON " + json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "init_ms": (t2 - t1) * 1000,
+    "first_use_ms": first_use,
+}))
+"""
+
+
+def run_probe():
+    env = dict(os.environ, HF_API_KEY=os.environ.get("HF_API_KEY", "startup-bench"),
+               GROQ_API_KEY=os.environ.get("GROQ_API_KEY", "startup-bench"))
+    output = subprocess.check_output([sys.executable, "-c", PROBE], cwd=project_root, env=env, text=True)
+    for line in output.splitlines():
+        if line.startswith("STARTUP_JSON "):
+            return json.loads(line[len("STARTUP_JSON "):])
+    raise RuntimeError("Startup probe produced no measurements")
+
+
+def slowest_imports(limit=10):
+    """
+    Top cumulative import times (µs) from `python -X importtime`.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.logger, src.mvp.processor"],
+        cwd=project_root, capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:   self_us |  cumulative_us | module"
+        _, cumulative_us, module = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append((int(cumulative_us), module))
+    rows.sort(reverse=True)
+    return [{"module": module, "cumulative_ms": round(us / 1000, 2)} for us, module in rows[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ParaGlow cold-start time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None, help="Fail if median import time exceeds this")
+    parser.add_argument("--max-init-ms", type=float, default=None, help="Fail if median ParaGlowProcessor() time exceeds this")
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(args.runs)]
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    init_ms = statistics.median(run["init_ms"] for run in runs)
+    components = sorted({name for run in runs for name in run["first_use_ms"]})
+    first_use_ms = {
+        name: round(statistics.median(run["first_use_ms"].get(name, 0.0) for run in runs), 2)
+        for name in components
+    }
+
+    print(f"🚀 Cold start over {args.runs} runs (median):")
+    print(f"   imports before first paint : {import_ms:8.1f} ms")
+    print(f"   ParaGlowProcessor()        : {init_ms:8.1f} ms")
+    for name, value in first_use_ms.items():
+        print(f"   first use · {name:<15}: {value:8.1f} ms")
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_ms": round(import_ms, 2),
+        "init_ms": round(init_ms, 2),
+        "first_use_ms": first_use_ms,
+        "slowest_imports": slowest_imports(),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    failed = False
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"❌ Import time {import_ms:.1f} ms exceeds budget {args.max_import_ms} ms")
+        failed = True
+    if args.max_init_ms is not None and init_ms > args.max_init_ms:
+        print(f"❌ Processor init {init_ms:.1f} ms exceeds budget {args.max_init_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
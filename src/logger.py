@@ -1,28 +1,157 @@
 # src/logger.py
+import atexit
 import logging
+import logging.handlers
 import os
-from src.utils import load_config
+import queue
+import threading
+from src.utils import get_config
 
-# Load config to get log file path
+LOG_FORMAT = "[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s"
+
+# Load config to get log file path (parsed once, shared with the app and processor)
 try:
-    config = load_config()
+    config = get_config()
     LOG_FILE_PATH = config['artifacts']['log_file_path']
+    LOG_SETTINGS = config.get('logging', {}) or {}
 except Exception as e:
     print(f"Error loading config for logger: {e}. Defaulting log path.")
     LOG_FILE_PATH = "logs/default.log"
+    LOG_SETTINGS = {}
 
 # Ensure the logs directory exists
 os.makedirs(os.path.dirname(LOG_FILE_PATH), exist_ok=True)
 
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a bounded queue without ever blocking the caller.
+    Past the high watermark INFO/DEBUG records are sampled (or dropped) so
+    warnings and errors keep the remaining headroom; a full queue drops the
+    record. Drops are reported by a single warning once the queue drains.
+    """
+
+    def __init__(self, log_queue, high_watermark=0.8, overflow_policy="sample", sample_every=10):
+        super().__init__(log_queue)
+        self.high_water = max(1, int(log_queue.maxsize * high_watermark))
+        self.overflow_policy = overflow_policy
+        self.sample_every = max(1, sample_every)
+
+        self.shed = 0
+        self.sampled = 0
+        self.dropped = 0
+        self._unreported = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, record):
+        if record.levelno < logging.WARNING and self.queue.qsize() >= self.high_water:
+            with self._lock:
+                self.shed += 1
+                keep = self.overflow_policy == "sample" and self.shed % self.sample_every == 0
+                if keep:
+                    self.sampled += 1
+                else:
+                    self.dropped += 1
+                    self._unreported += 1
+            if not keep:
+                return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._unreported += 1
+            return
+        self._report_drops()
+
+    def _report_drops(self):
+        if not self._unreported or self.queue.qsize() >= self.high_water:
+            return
+        with self._lock:
+            count, self._unreported = self._unreported, 0
+        if count:
+            notice = logging.makeLogRecord({
+                "name": "SummarizerAppLogger", "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": f"Logging queue overloaded: dropped {count} records.",
+            })
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                with self._lock:
+                    self._unreported += count
+
+    def stats(self):
+        """
+        Queue depth and overflow counters.
+        """
+        with self._lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "queue_size": self.queue.maxsize,
+                "shed": self.shed,
+                "sampled": self.sampled,
+                "dropped": self.dropped,
+            }
+
+
+def _file_handler(path, settings):
+    """
+    Size- or time-based rotating file handler from the 'logging' section of config.yaml.
+    """
+    if settings.get('rotation', 'size') == 'time':
+        return logging.handlers.TimedRotatingFileHandler(
+            path,
+            when=settings.get('when', 'midnight'),
+            interval=settings.get('interval', 1),
+            backupCount=settings.get('backup_count', 5),
+            encoding='utf-8',
+            delay=True,
+        )
+    return logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=settings.get('max_bytes', 5 * 1024 * 1024),
+        backupCount=settings.get('backup_count', 5),
+        encoding='utf-8',
+        delay=True,
+    )
+
+
+def _setup_logging(path, settings):
+    """
+    Routes the root logger through a bounded queue; a QueueListener thread does the disk/console writes.
+    """
+    root = logging.getLogger()
+    for handler in root.handlers:
+        if isinstance(handler, BoundedQueueHandler):
+            # Already set up in this process (e.g. module re-imported)
+            return handler, None
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [_file_handler(path, settings)]
+    if settings.get('console', True):
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=settings.get('queue_size', 10000))
+    queue_handler = BoundedQueueHandler(
+        log_queue,
+        high_watermark=settings.get('high_watermark', 0.8),
+        overflow_policy=settings.get('overflow_policy', 'sample'),
+        sample_every=settings.get('sample_every', 10),
+    )
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued on interpreter exit
+    atexit.register(listener.stop)
+
+    root.setLevel(settings.get('level', 'INFO'))
+    root.addHandler(queue_handler)
+    return queue_handler, listener
+
+
 # Set up the logger
-logging.basicConfig(
-    level=logging.INFO,
-    format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE_PATH), # Log to a file
-        logging.StreamHandler()             # Log to the console (terminal)
-    ]
-)
+queue_handler, listener = _setup_logging(LOG_FILE_PATH, LOG_SETTINGS)
 
 # Create a logger instance
-logger = logging.getLogger("SummarizerAppLogger")
\ No newline at end of file
+logger = logging.getLogger("SummarizerAppLogger")
@@ -0,0 +1,463 @@
+# src/mvp/batch.py
+"""
+Batch runs over JSONL / CSV corpora.
+
+    python -m src.mvp.batch corpus.jsonl -o summaries.jsonl --concurrency 8
+    python -m src.mvp.batch corpus.csv -o variants.jsonl --operation paraphrase --text-field body --id-field doc_id
+
+Every record goes through ParaGlowProcessor and its result is appended to the
+output JSONL as soon as it finishes ({"index", "id", "attempt", "result"} or
+{"index", "id", "attempt", "error"}; completion order, not input order). A
+checkpoint next to the output records finished indices, so rerunning the
+same command after an interruption skips everything already written. The
+checkpoint is saved every few seconds together with how much of the output
+it covers; rows written after that are replayed from the output on resume,
+so a crash between the two never duplicates a row.
+
+With --retry-failed, records that failed are run again and appended with a
+higher `attempt`, so an index can appear more than once: the row with the
+highest attempt for an index is the current one.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .cache import is_cacheable
+from .corpus import CorpusReader, shard_range
+
+OPERATIONS = ("summarize", "paraphrase")
+
+
+# --- Input ---
+def input_format(path):
+    return "csv" if path.lower().endswith((".csv", ".tsv")) else "jsonl"
+
+
+def iter_records(path, text_field="text", id_field="id", start=0, stop=None):
+    """
+    Yields (index, record_id, text, error) for records [start, stop); error is
+    set (and text None) when a record cannot be parsed or has no text field.
+    """
+    if input_format(path) == "jsonl":
+        with CorpusReader(path) as reader:
+            yield from iter_corpus(reader, text_field, id_field, start, stop)
+        return
+
+    with open(path, newline="", encoding="utf-8") as f:
+        for index, row in enumerate(_csv_rows(f, path)):
+            if stop is not None and index >= stop:
+                break
+            if index >= start:
+                yield _record(index, row, text_field, id_field)
+
+
+def _csv_rows(f, path):
+    # DictReader skips blank rows; counting and reading both go through it
+    return csv.DictReader(f, delimiter="\t" if path.lower().endswith(".tsv") else ",")
+
+
+def iter_corpus(reader, text_field="text", id_field="id", start=0, stop=None):
+    """
+    iter_records() over an open CorpusReader: starts at `start` without
+    reading anything before it.
+    """
+    for index, row, error in reader.iter_rows(start, stop):
+        yield (index, None, None, error) if error else _record(index, row, text_field, id_field)
+
+
+def _record(index, row, text_field, id_field):
+    if not isinstance(row, dict):
+        return index, None, None, "❌ Record is not an object."
+    record_id = row.get(id_field, index)
+    text = row.get(text_field)
+    if not isinstance(text, str) or not text.strip():
+        return index, record_id, None, f"⚠️ Missing '{text_field}' field."
+    return index, record_id, text, None
+
+
+def count_records(path):
+    """
+    Record count for progress/ETA: read from the offset index for JSONL,
+    the rows DictReader yields (blank rows skipped) for CSV.
+    """
+    if input_format(path) == "jsonl":
+        with CorpusReader(path) as reader:
+            return len(reader)
+    with open(path, newline="", encoding="utf-8") as f:
+        return sum(1 for _ in _csv_rows(f, path))
+
+
+# --- Checkpoint ---
+class Checkpoint:
+    """
+    Finished record indices, saved atomically every `save_interval` seconds.
+
+    Stored compactly as a watermark (every index below it is done) plus the
+    few finished indices above it; with bounded in-flight work that set stays
+    about as small as the concurrency. Failed indices are kept separately so
+    --retry-failed can run them again.
+
+    The output JSONL is the journal and the checkpoint a snapshot of it: each
+    save records the output size it covers, and load() replays rows written
+    after that, so the output is never duplicated and saves can be rare.
+    """
+
+    def __init__(self, path, fingerprint, retry_failed=False, start=0, output_path=None, save_interval=2.0):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.retry_failed = retry_failed
+        # First index of this run's range (non-zero for shards)
+        self.start = start
+        self.output_path = output_path
+        self.save_interval = save_interval
+        self._saved_at = time.monotonic()
+        self.watermark = start
+        self.done_above = set()
+        self.failed = set()
+        # Failed last run and queued again by --retry-failed
+        self.retrying = set()
+        # Attempts so far of every failed (or retrying) index
+        self.attempts = {}
+        self.resumed = 0
+
+    def load(self):
+        """
+        Restores a previous run's progress. Raises ValueError if the checkpoint
+        belongs to a different input or settings.
+        """
+        if not os.path.exists(self.path):
+            return self
+        with open(self.path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("fingerprint") != self.fingerprint:
+            raise ValueError(
+                f"Checkpoint {self.path} was written for a different input or settings "
+                "(use --restart to start over)."
+            )
+        self.watermark = state["watermark"]
+        self.done_above = set(state["done_above"])
+        self.failed = set(state["failed"])
+        self.attempts = {int(index): count for index, count in state.get("attempts", {}).items()}
+        if state.get("output_bytes") is not None:
+            self._replay(state["output_bytes"])
+        if self.retry_failed:
+            self.retrying, self.failed = self.failed, set()
+        self.resumed = self.watermark - self.start + len(self.done_above) - len(self.retrying)
+        return self
+
+    def _replay(self, offset):
+        """
+        Marks the output rows written after the last save; drops a torn last line.
+        """
+        if not self.output_path or not os.path.exists(self.output_path):
+            return
+        with open(self.output_path, "r+b") as f:
+            f.seek(offset)
+            tail = f.read()
+            complete = tail.rfind(b"\n") + 1
+            for line in tail[:complete].splitlines():
+                row = json.loads(line)
+                failed = "error" in row
+                self.mark(row["index"], failed)
+                if failed:
+                    self.attempts[row["index"]] = row.get("attempt", self.attempts[row["index"]])
+            if complete < len(tail):
+                f.truncate(offset + complete)
+
+    @property
+    def resume_from(self):
+        """
+        First index worth reading: everything below the watermark is done,
+        unless failed records are being retried.
+        """
+        return self.start if self.retrying else self.watermark
+
+    def is_done(self, index):
+        if index in self.retrying:
+            return False
+        return index < self.watermark or index in self.done_above
+
+    def attempt(self, index):
+        """
+        Attempt number of the run about to finish for `index` (1 = first run).
+        """
+        return self.attempts.get(index, 0) + 1
+
+    def mark(self, index, failed=False):
+        self.retrying.discard(index)
+        if failed:
+            self.failed.add(index)
+            self.attempts[index] = self.attempt(index)
+        else:
+            self.failed.discard(index)
+            self.attempts.pop(index, None)
+        if index >= self.watermark:
+            self.done_above.add(index)
+        while self.watermark in self.done_above:
+            self.done_above.remove(self.watermark)
+            self.watermark += 1
+
+    def save_due(self, output=None):
+        """
+        Saves if save_interval has passed since the last save.
+        """
+        if time.monotonic() - self._saved_at >= self.save_interval:
+            self.save(output)
+
+    def save(self, output=None):
+        """
+        Args:
+            output: The open output file; flushed to disk first and its size
+                recorded, so rows written after this save can be replayed
+        """
+        state = {
+            "fingerprint": self.fingerprint,
+            "watermark": self.watermark,
+            "done_above": sorted(self.done_above),
+            "failed": sorted(self.failed | self.retrying),
+            "attempts": {str(index): count for index, count in sorted(self.attempts.items())},
+        }
+        if output is not None:
+            output.flush()
+            os.fsync(output.fileno())
+            state["output_bytes"] = os.fstat(output.fileno()).st_size
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        # Atomic on POSIX and Windows: a crash leaves the old or the new checkpoint
+        os.replace(tmp, self.path)
+        self._saved_at = time.monotonic()
+
+
+# --- Progress ---
+class Progress:
+    """
+    One live status line on stderr: done/total, throughput, ETA and errors.
+    """
+
+    def __init__(self, total, skipped=0, interval=1.0, stream=None):
+        self.total = total
+        self.skipped = skipped
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.done = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self._last_print = 0.0
+
+    def update(self, failed=False, force=False):
+        if not force:
+            self.done += 1
+            self.errors += failed
+        now = time.perf_counter()
+        if not force and now - self._last_print < self.interval:
+            return
+        self._last_print = now
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        finished = self.skipped + self.done
+        remaining = max(self.total - finished, 0)
+        eta = _format_duration(remaining / rate) if rate > 0 else "--"
+        percent = 100.0 * finished / self.total if self.total else 100.0
+        self.stream.write(
+            f"\r📦 {finished:,}/{self.total:,} ({percent:.1f}%) · {rate:.1f} rec/s · "
+            f"ETA {eta} · errors {self.errors:,}   "
+        )
+        self.stream.flush()
+
+    def close(self):
+        self.update(force=True)
+        self.stream.write("\n")
+
+
+def _format_duration(seconds):
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+# --- Runner ---
+class BatchRunner:
+    """
+    Runs records through the processor on a thread pool with bounded
+    in-flight work; results are written by the calling thread as they
+    complete and checkpointed periodically and on exit.
+    """
+
+    def __init__(self, processor, operation="summarize", method="abstractive", length="medium",
+                 num_return_sequences=3, concurrency=8):
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation}")
+        self.processor = processor
+        self.operation = operation
+        self.method = method
+        self.length = length
+        self.num_return_sequences = num_return_sequences
+        self.concurrency = concurrency
+
+    def process(self, text):
+        if self.operation == "summarize":
+            return self.processor.summarize(text, method=self.method, length=self.length)
+        return self.processor.paraphrase(text, self.num_return_sequences)
+
+    def run(self, records, output, checkpoint, progress):
+        """
+        Args:
+            records: Iterable of (index, record_id, text, error)
+            output: Text file opened for appending
+            checkpoint (Checkpoint): Skips finished records; updated after each write, saved periodically
+            progress (Progress): Live status line
+        """
+        # Enough queued work to keep every worker busy, without reading the whole corpus ahead
+        max_pending = self.concurrency * 2
+        pending = {}
+
+        def finish(index, record_id, result):
+            failed = not is_cacheable(result)
+            row = {"index": index, "id": record_id, "attempt": checkpoint.attempt(index),
+                   ("error" if failed else "result"): result}
+            output.write(json.dumps(row, ensure_ascii=False) + "\n")
+            output.flush()
+            checkpoint.mark(index, failed)
+            checkpoint.save_due(output)
+            progress.update(failed)
+
+        def drain(return_when):
+            done, _ = wait(pending, return_when=return_when)
+            for future in done:
+                index, record_id = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = f"❌ Error: {e}"
+                finish(index, record_id, result)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="paraglow-batch") as pool:
+            try:
+                for index, record_id, text, error in records:
+                    if checkpoint.is_done(index):
+                        continue
+                    if error is not None:
+                        finish(index, record_id, error)
+                        continue
+                    pending[pool.submit(self.process, text)] = (index, record_id)
+                    if len(pending) >= max_pending:
+                        drain(FIRST_COMPLETED)
+                if pending:
+                    drain(ALL_COMPLETED)
+            except KeyboardInterrupt:
+                # Keep what already finished; queued records run again on resume
+                for future in pending:
+                    future.cancel()
+                raise
+            finally:
+                checkpoint.save(output)
+
+
+def fingerprint(path, args):
+    stat = os.stat(path)
+    return {
+        "input": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "operation": args.operation,
+        "method": args.method,
+        "length": args.length,
+        "num_return_sequences": args.num_return_sequences,
+        "text_field": args.text_field,
+        "shard": args.shard,
+    }
+
+
+def main(argv=None):
+    from src.utils import get_config
+
+    batch_config = (get_config() or {}).get("batch") or {}
+    parser = argparse.ArgumentParser(description="Summarize or paraphrase a JSONL/CSV corpus with ParaGlow.")
+    parser.add_argument("input", help="JSONL (one object per line) or CSV/TSV with a header row")
+    parser.add_argument("-o", "--output", required=True, help="Results JSONL (appended to on resume)")
+    parser.add_argument("--operation", choices=OPERATIONS, default="summarize")
+    parser.add_argument("--method", choices=["abstractive", "extractive"], default="abstractive")
+    parser.add_argument("--length", choices=["short", "medium", "long"], default="medium")
+    parser.add_argument("--num-return-sequences", type=int, default=3)
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--concurrency", type=int, default=batch_config.get("concurrency", 8))
+    parser.add_argument("--shard", default=None, metavar="K/N",
+                        help="Process only contiguous shard K of N (0-based), e.g. one per machine")
+    parser.add_argument("--checkpoint", default=None, help="Defaults to <output>.checkpoint.json")
+    parser.add_argument("--retry-failed", action="store_true", help="Run records that failed last time again")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and overwrite the output")
+    args = parser.parse_args(argv)
+
+    checkpoint_path = args.checkpoint or args.output + ".checkpoint.json"
+    if args.restart:
+        for path in (checkpoint_path, args.output):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # JSONL goes through the memory-mapped reader: the offset index gives the
+    # record count and lets a resume start at the checkpoint without re-reading
+    reader = CorpusReader(args.input).open() if input_format(args.input) == "jsonl" else None
+    try:
+        return _run(args, reader, checkpoint_path, batch_config)
+    finally:
+        # Closed on every exit: bad checkpoint, interrupt, error or success
+        if reader is not None:
+            reader.close()
+
+
+def _run(args, reader, checkpoint_path, batch_config):
+    total = len(reader) if reader is not None else count_records(args.input)
+    start, stop = 0, total
+    if args.shard:
+        shard, shards = (int(part) for part in args.shard.split("/"))
+        start, stop = shard_range(total, shard, shards)
+    try:
+        checkpoint = Checkpoint(
+            checkpoint_path, fingerprint(args.input, args), args.retry_failed, start,
+            output_path=args.output, save_interval=batch_config.get("checkpoint_interval", 2.0),
+        ).load()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    if reader is not None and reader.index_built:
+        print(f"🗂️ Indexed {total:,} records → {reader.index_path}")
+    if checkpoint.resumed:
+        print(f"♻️ Resuming: {checkpoint.resumed:,} of {stop - start:,} records already done")
+
+    from .processor import ParaGlowProcessor
+    runner = BatchRunner(
+        ParaGlowProcessor(),
+        operation=args.operation,
+        method=args.method,
+        length=args.length,
+        num_return_sequences=args.num_return_sequences,
+        concurrency=args.concurrency,
+    )
+    progress = Progress(stop - start, skipped=checkpoint.resumed, interval=batch_config.get("progress_interval", 1.0))
+    if reader is not None:
+        records = iter_corpus(reader, args.text_field, args.id_field, checkpoint.resume_from, stop)
+    else:
+        records = iter_records(args.input, args.text_field, args.id_field, checkpoint.resume_from, stop)
+    try:
+        with open(args.output, "a", encoding="utf-8") as output:
+            runner.run(records, output, checkpoint, progress)
+    except KeyboardInterrupt:
+        progress.close()
+        print(f"⏸️ Interrupted. Rerun the same command to resume ({checkpoint_path}).")
+        return 130
+    progress.close()
+    print(f"✅ {progress.done:,} records in {time.perf_counter() - progress.started:.1f} s, "
+          f"{progress.errors:,} errors → {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
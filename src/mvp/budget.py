@@ -0,0 +1,74 @@
+# src/mvp/budget.py
+from .tokens import estimate_tokens
+
+# Summary length presets (model tokens) shared by the Hugging Face clients
+LENGTH_PRESETS = {
+    'short': {"max_length": 60, "min_length": 30},
+    'medium': {"max_length": 130, "min_length": 60},
+    'long': {"max_length": 200, "min_length": 130},
+}
+
+
+class SummaryBudget:
+    """
+    Decision for one summarization input, made before any network call:
+      - 'passthrough': the input is already shorter than a summary would be
+      - 'fits':        one request, with min/max_length scaled to the input
+      - 'chunk':       larger than the model window, needs map-reduce
+    """
+
+    def __init__(self, action, input_tokens, min_length=None, max_length=None):
+        self.action = action
+        self.input_tokens = input_tokens
+        self.min_length = min_length
+        self.max_length = max_length
+
+    @property
+    def parameters(self):
+        """
+        Length parameters for the inference payload.
+        """
+        return {"max_length": self.max_length, "min_length": self.min_length}
+
+    def as_dict(self):
+        return {
+            "action": self.action,
+            "input_tokens": self.input_tokens,
+            "min_length": self.min_length,
+            "max_length": self.max_length,
+        }
+
+
+def scale_length_preset(preset, input_tokens, max_ratio=0.75, min_ratio=0.3):
+    """
+    Caps a length preset so the summary stays shorter than its input.
+
+    Returns:
+        (min_length, max_length)
+    """
+    max_length = max(8, min(preset["max_length"], int(input_tokens * max_ratio)))
+    min_length = max(0, min(preset["min_length"], int(input_tokens * min_ratio), max_length - 1))
+    return min_length, max_length
+
+
+def plan_summary(text, length, max_input_tokens, passthrough_tokens=16):
+    """
+    Decides how to summarize text with a model whose input budget is max_input_tokens.
+
+    Args:
+        text (str): Input text
+        length (str): 'short', 'medium' or 'long'
+        max_input_tokens (int): Tokens one request may carry
+        passthrough_tokens (int): Inputs this small are returned as-is
+
+    Returns:
+        SummaryBudget
+    """
+    tokens = estimate_tokens(text)
+    if tokens <= passthrough_tokens:
+        return SummaryBudget("passthrough", tokens)
+    preset = LENGTH_PRESETS.get(length, LENGTH_PRESETS['medium'])
+    if tokens > max_input_tokens:
+        return SummaryBudget("chunk", tokens, preset["min_length"], preset["max_length"])
+    min_length, max_length = scale_length_preset(preset, tokens)
+    return SummaryBudget("fits", tokens, min_length, max_length)
@@ -0,0 +1,164 @@
+# src/mvp/cache.py
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from .segment import normalize_whitespace
+
+# Results that must never be memoized (upstream errors, loading notices, validation messages)
+ERROR_PREFIXES = ("⚠️", "❌")
+# Error results that mean the upstream cannot serve right now (not bad input)
+UNAVAILABLE_MARKERS = ("Model is loading", "circuit open", "Too many jobs queued")
+
+
+def normalize_text(text):
+    """
+    Collapses whitespace so trivially different submissions share a cache entry.
+    """
+    return normalize_whitespace(text)
+
+
+def make_cache_key(text, backend, model_name, preset, sampling_params=None):
+    """
+    Builds a content-addressed key for one summarize/paraphrase request.
+
+    Args:
+        text (str): Raw input text (normalized before hashing)
+        backend (str): 'abstractive', 'extractive' or 'paraphrase'
+        model_name (str): Upstream model identifier
+        preset (str | int): Length preset or num_return_sequences
+        sampling_params (dict): Sampling settings sent upstream
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    fingerprint = json.dumps(
+        {
+            "text": normalize_text(text),
+            "backend": backend,
+            "model": model_name,
+            "preset": preset,
+            "sampling": sampling_params or {},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(result):
+    """
+    Only successful results are cached; error and loading messages are not.
+    """
+    return isinstance(result, str) and bool(result.strip()) and not result.startswith(ERROR_PREFIXES)
+
+
+def is_unavailable(result):
+    """
+    True for error results that are worth retrying later (model loading, circuit open).
+    """
+    return isinstance(result, str) and result.startswith(ERROR_PREFIXES) and any(
+        marker in result for marker in UNAVAILABLE_MARKERS
+    )
+
+
+class ResultCache:
+    """
+    Thread-safe in-memory LRU cache with TTL and size limits.
+    Shared by every Streamlit session through the cached ParaGlowProcessor.
+    """
+
+    def __init__(self, max_entries=512, max_bytes=8 * 1024 * 1024, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds a cache from the 'cache' section of config.yaml.
+        """
+        config = config or {}
+        return cls(
+            max_entries=config.get("max_entries", 512),
+            max_bytes=config.get("max_bytes", 8 * 1024 * 1024),
+            ttl_seconds=config.get("ttl_seconds", 3600),
+        )
+
+    def get(self, key):
+        """
+        Returns the cached value or None on a miss (or expired entry).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Stores a successful result; error strings are silently ignored.
+        """
+        if not is_cacheable(value):
+            return
+
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Returns hit/miss/eviction counters and current occupancy.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
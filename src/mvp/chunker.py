@@ -0,0 +1,114 @@
+# src/mvp/chunker.py
+import zlib
+
+from .segment import ends_sentence, normalize_whitespace, split_sentences
+from .tokens import TOKENS_PER_WORD, estimate_tokens
+
+
+def chunk_text(text, max_tokens):
+    """
+    Packs whole sentences into chunks that stay under the token budget.
+    A single sentence longer than the budget is split on word boundaries.
+
+    Args:
+        text (str): Input document
+        max_tokens (int): Token budget per chunk
+
+    Returns:
+        list[str]: Chunks in document order
+    """
+    return list(iter_chunks([text], max_tokens))
+
+
+def stable_chunks(text, max_tokens, target_tokens=None):
+    """
+    Content-defined chunking for incremental re-summarization.
+
+    Greedy packing (chunk_text) shifts every boundary after an edit, so every
+    later chunk changes. Here a chunk also ends after any "anchor" sentence,
+    chosen by a hash of the sentence itself, so boundaries depend only on
+    nearby text: editing one paragraph changes the chunk(s) around it and the
+    rest keep the same content (and cached partial summaries).
+
+    Args:
+        text (str): Input document
+        max_tokens (int): Hard token budget per chunk
+        target_tokens (int): Chunk size to aim for (default 3/4 of max_tokens,
+            leaving room so few chunks are cut by the hard limit)
+
+    Returns:
+        list[str]: Chunks in document order
+    """
+    return list(iter_chunks([text], max_tokens, target_tokens or max_tokens * 3 // 4))
+
+
+def _is_anchor(sentence, tokens, target_tokens):
+    """
+    True for roughly tokens/target_tokens of sentences, decided by content alone.
+    """
+    digest = zlib.crc32(normalize_whitespace(sentence).encode("utf-8"))
+    return digest % 10000 < 10000 * tokens / target_tokens
+
+
+def iter_chunks(pieces, max_tokens, target_tokens=None):
+    """
+    Streaming chunk_text(): packs sentences from consecutive pieces of one
+    document (e.g. pages as they are parsed) and yields each chunk as soon as
+    it is full.
+
+    Args:
+        pieces (Iterable[str]): Document text in order
+        max_tokens (int): Token budget per chunk
+        target_tokens (int): If set, also cut at content-defined anchors
+            (see stable_chunks()) once a chunk holds a quarter of this
+
+    Yields:
+        str: Chunks in document order
+    """
+    current, current_tokens = [], 0
+    min_tokens = target_tokens // 4 if target_tokens else None
+
+    for sentence in _iter_sentences(pieces, max_tokens):
+        tokens = estimate_tokens(sentence)
+
+        if tokens > max_tokens:
+            if current:
+                yield " ".join(current)
+                current, current_tokens = [], 0
+            words = sentence.split()
+            step = max(1, int(max_tokens / TOKENS_PER_WORD) - 1)
+            for i in range(0, len(words), step):
+                yield " ".join(words[i:i + step])
+            continue
+
+        if current and current_tokens + tokens > max_tokens:
+            yield " ".join(current)
+            current, current_tokens = [], 0
+
+        current.append(sentence)
+        current_tokens += tokens
+
+        if target_tokens and current_tokens >= min_tokens and _is_anchor(sentence, tokens, target_tokens):
+            yield " ".join(current)
+            current, current_tokens = [], 0
+
+    if current:
+        yield " ".join(current)
+
+
+def _iter_sentences(pieces, max_tokens):
+    """
+    Sentences across pieces; a sentence cut by a piece boundary (page break)
+    is carried over and completed by the next piece.
+    """
+    carry = ""
+    for piece in pieces:
+        text = f"{carry} {piece}" if carry else piece
+        sentences = split_sentences(text)
+        carry = ""
+        # Unpunctuated text (tables, headings) is not carried past one window
+        if sentences and not ends_sentence(text) and estimate_tokens(sentences[-1]) < max_tokens:
+            carry = sentences.pop()
+        yield from sentences
+    if carry:
+        yield carry
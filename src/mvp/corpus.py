@@ -0,0 +1,205 @@
+# src/mvp/corpus.py
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+
+# Index file layout: header, then count + 1 little-endian uint64 offsets
+# (start of each record, then the file size as an end sentinel).
+INDEX_MAGIC = b"PGLIDX01"
+INDEX_HEADER = struct.Struct("<8sQQQ")  # magic, source size, source mtime_ns, record count
+# Offsets buffered per write while building the index
+INDEX_BATCH = 65536
+# Sequential reads hand already-consumed pages back to the OS every this many bytes
+RELEASE_EVERY = 64 * 1024 * 1024
+
+
+def shard_range(total, shard, shards):
+    """
+    (start, stop) of contiguous shard `shard` out of `shards` over `total` records.
+    """
+    if not 0 <= shard < shards:
+        raise ValueError(f"shard must be in [0, {shards})")
+    return total * shard // shards, total * (shard + 1) // shards
+
+
+class CorpusReader:
+    """
+    Memory-mapped JSONL corpus with an on-disk line-offset index.
+
+    The index (<path>.idx by default) is built once with a single scan and
+    rebuilt only when the file's size or mtime changes. Both the corpus and
+    the index are mapped, not read, so record i is an O(1) lookup, records
+    can be split into contiguous shards for parallel workers, and memory use
+    stays flat no matter how large the corpus is. Blank lines are skipped.
+    """
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._file = None
+        self._map = None
+        self._view = None
+        self._index_file = None
+        self._index_map = None
+        self._offsets = ()
+        self.index_built = False
+
+    def open(self):
+        self._file = open(self.path, "rb")
+        try:
+            stat = os.fstat(self._file.fileno())
+            if stat.st_size:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._map)
+            if not self._index_current(stat):
+                self._build_index(stat)
+                self.index_built = True
+            self._load_index()
+        except BaseException:
+            # Don't leak the file/maps opened so far
+            self.close()
+            raise
+        return self
+
+    def close(self):
+        # Views must be released before their maps can be closed
+        for view in (self._offsets, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        self._offsets, self._view = (), None
+        for handle in (self._index_map, self._index_file, self._map, self._file):
+            if handle is not None:
+                handle.close()
+        self._index_map = self._index_file = self._map = self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------- Index --------
+    def _index_current(self, stat):
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(INDEX_HEADER.size)
+        except OSError:
+            return False
+        if len(header) < INDEX_HEADER.size:
+            return False
+        magic, size, mtime_ns, _ = INDEX_HEADER.unpack(header)
+        return magic == INDEX_MAGIC and size == stat.st_size and mtime_ns == stat.st_mtime_ns
+
+    def _build_index(self, stat):
+        """
+        One pass over the mapped file, streaming offsets to disk in batches.
+        """
+        tmp = self.index_path + ".tmp"
+        count = 0
+        with open(tmp, "wb") as out:
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, 0))
+            batch = array.array("Q")
+            data, position, size, released = self._map, 0, stat.st_size, 0
+            while position < size:
+                end = data.find(b"\n", position)
+                if end < 0:
+                    end = size
+                # Only whitespace-leading lines need the (copying) blank check
+                if end > position and not (data[position] in b" \t\r" and data[position:end].isspace()):
+                    batch.append(position)
+                    count += 1
+                    if len(batch) >= INDEX_BATCH:
+                        self._write_offsets(out, batch)
+                        batch = array.array("Q")
+                position = end + 1
+                if position - released >= RELEASE_EVERY:
+                    self._release(released, position)
+                    released = position
+            batch.append(size)
+            self._write_offsets(out, batch)
+            out.seek(0)
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, count))
+        os.replace(tmp, self.index_path)
+
+    @staticmethod
+    def _write_offsets(out, batch):
+        if sys.byteorder != "little":
+            batch.byteswap()
+        batch.tofile(out)
+
+    def _load_index(self):
+        self._index_file = open(self.index_path, "rb")
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, _, count = INDEX_HEADER.unpack_from(self._index_map)
+        view = memoryview(self._index_map)[INDEX_HEADER.size:INDEX_HEADER.size + (count + 1) * 8]
+        if sys.byteorder == "little":
+            # Offsets are read straight from the mapped index file
+            self._offsets = view.cast("Q")
+        else:
+            self._offsets = array.array("Q", view)
+            self._offsets.byteswap()
+            view.release()
+
+    def _release(self, start, stop):
+        """
+        Lets the kernel drop already-read pages so RSS does not grow with the file
+        (they are re-read from disk if touched again).
+        """
+        if self._map is None or not hasattr(mmap, "MADV_DONTNEED"):
+            return
+        start -= start % mmap.PAGESIZE
+        stop -= stop % mmap.PAGESIZE
+        if stop > start:
+            self._map.madvise(mmap.MADV_DONTNEED, start, stop - start)
+
+    # -------- Access --------
+    def __len__(self):
+        return max(len(self._offsets) - 1, 0)
+
+    def record_bytes(self, index):
+        """
+        Zero-copy view of record `index`'s raw line (no bytes object is created).
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._view[self._offsets[index]:self._offsets[index + 1]]
+
+    def record(self, index):
+        """
+        Parsed record `index`. The text is decoded straight from the mapped pages.
+        """
+        view = self.record_bytes(index)
+        try:
+            return json.loads(str(view, "utf-8"))
+        finally:
+            view.release()
+
+    def __getitem__(self, index):
+        return self.record(index)
+
+    def shard(self, shard, shards):
+        """
+        (start, stop) record range of shard `shard` out of `shards` contiguous shards.
+        """
+        return shard_range(len(self), shard, shards)
+
+    def iter_rows(self, start=0, stop=None):
+        """
+        Yields (index, row, error) for records [start, stop) in order; rows that
+        are not valid JSON come back as (index, None, error message).
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        released = self._offsets[start] if start < stop else 0
+        for index in range(start, stop):
+            try:
+                row, error = self.record(index), None
+            except ValueError as e:
+                row, error = None, f"❌ Invalid JSON: {e}"
+            yield index, row, error
+            offset = self._offsets[index + 1]
+            if offset - released >= RELEASE_EVERY:
+                self._release(released, offset)
+                released = offset
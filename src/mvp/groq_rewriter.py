@@ -1,6 +1,18 @@
+import json
+import math
 import os
-import requests
-from dotenv import load_dotenv
+import re
+import time
+from src.utils import load_env
+from .transport import HTTPTransport, AsyncHTTPTransport
+from .rate_limiter import RateLimiter
+from .segment import iter_lines, strip_bullet
+from .tokens import estimate_tokens, model_window
+from . import metrics
+from .tracing import span
+
+# Complete JSON string literals, used to salvage variants from truncated JSON
+_JSON_STRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
 
 
 class GroqRewriter:
@@ -11,8 +23,14 @@ class GroqRewriter:
       - llama-3.1-70b-versatile (higher quality, slower)
     """
 
-    def __init__(self, api_key=None, model_name="llama-3.1-8b-instant"):
-        load_dotenv()
+    provider = "groq"
+    backend = "paraphrase"
+
+    def __init__(self, api_key=None, model_name="llama-3.1-8b-instant", transport=None, async_transport=None,
+                 rate_limiter=None, api_url="https://api.groq.com/openai/v1/chat/completions",
+                 json_mode=True, token_headroom=1.5, min_completion_tokens=64, max_completion_tokens=2048,
+                 router=None):
+        load_env()
 
         # ✅ Support both manual and env-based API key
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
@@ -21,25 +39,290 @@ class GroqRewriter:
             raise ValueError("❌ GROQ_API_KEY not found in .env")
 
         # ✅ Correct REST endpoint (no '/openai/')
-        self.api_url = "https://api.groq.com/openai/v1/chat/completions"
+        self.api_url = api_url
 
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         self.model_name = model_name
+        # max_tokens is sized per request from the input (see _completion_budget)
+        self.sampling_params = {"temperature": 0.9}
+        # Non-streaming calls ask for {"variants": [...]} instead of free text
+        self.json_mode = json_mode
+        self.token_headroom = token_headroom
+        self.min_completion_tokens = min_completion_tokens
+        self.max_completion_tokens = max_completion_tokens
+        # Shared pooled transport (owned by ParaGlowProcessor); standalone use gets its own
+        self.transport = transport or HTTPTransport()
+        self.async_transport = async_transport or AsyncHTTPTransport()
+        # Client-side RPM/TPM limiter: queue locally instead of collecting 429s
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Optional ModelRouter: latency-based model choice and hedged requests
+        self.router = router
 
-    def paraphrase(self, text, num_return_sequences=3):
+    def paraphrase(self, text, num_return_sequences=3, ctx=None):
         """
         Generate paraphrased versions of input text using Groq Cloud API.
         """
         if not text.strip():
             return ["⚠️ Please provide valid text."]
 
+        payload = self._build_payload(text, num_return_sequences)
+        estimated = self._estimate_request_tokens(payload)
+        # Fits no routable model: reject before queueing for quota
+        error = self._check_window(estimated, self._widest_model())
+        if error:
+            return [error]
+
+        # Queue for quota before routing so limiter waits don't count as model latency
+        try:
+            with span(ctx, "queue", kind="rate_limit", estimated_tokens=estimated):
+                self.rate_limiter.acquire(estimated)
+        except Exception as e:
+            return [f"❌ Error: {str(e)}"]
+
+        def send(model, hedged):
+            return self._send(payload, num_return_sequences, estimated, model, hedged, ctx)
+
+        if self.router is None:
+            return send(None, False)
+        return self.router.call(send, self._failed)
+
+    def _send(self, payload, num_return_sequences, estimated, model=None, hedged=False, ctx=None):
+        """
+        One paraphrase request to `model` (a ModelEndpoint, or the default model).
+        Hedged attempts only go out if the rate limiter has room right now; returns None otherwise.
+        """
+        model_name, api_url = self._target(model)
+        error = self._check_window(estimated, model_name)
+        if error:
+            if hedged:
+                return None
+            # Nothing is sent: give the quota taken by the caller back
+            self.rate_limiter.reconcile(estimated, 0)
+            return [error]
+        if hedged and not self.rate_limiter.try_acquire(estimated):
+            return None
+        try:
+            response = self.transport.post(
+                api_url, headers=self.headers, json={**payload, "model": model_name},
+                labels=self._metric_labels(num_return_sequences, model_name), ctx=ctx,
+            )
+            with span(ctx, "parse", model=model_name, hedged=hedged):
+                return self._handle_response(response, num_return_sequences, estimated, model_name)
+        except Exception as e:
+            return [f"❌ Error: {str(e)}"]
+
+    async def aparaphrase(self, text, num_return_sequences=3, ctx=None):
+        """
+        Async version of paraphrase(); shares the payload and response handling.
+        """
+        if not text.strip():
+            return ["⚠️ Please provide valid text."]
+
+        payload = self._build_payload(text, num_return_sequences)
+        estimated = self._estimate_request_tokens(payload)
+        # Fits no routable model: reject before queueing for quota
+        error = self._check_window(estimated, self._widest_model())
+        if error:
+            return [error]
+
+        try:
+            with span(ctx, "queue", kind="rate_limit", estimated_tokens=estimated):
+                await self.rate_limiter.aacquire(estimated)
+        except Exception as e:
+            return [f"❌ Error: {str(e)}"]
+
+        def send(model, hedged):
+            return self._asend(payload, num_return_sequences, estimated, model, hedged, ctx)
+
+        if self.router is None:
+            return await send(None, False)
+        return await self.router.acall(send, self._failed)
+
+    async def _asend(self, payload, num_return_sequences, estimated, model=None, hedged=False, ctx=None):
+        """
+        Async version of _send().
+        """
+        model_name, api_url = self._target(model)
+        error = self._check_window(estimated, model_name)
+        if error:
+            if hedged:
+                return None
+            # Nothing is sent: give the quota taken by the caller back
+            self.rate_limiter.reconcile(estimated, 0)
+            return [error]
+        if hedged and not self.rate_limiter.try_acquire(estimated):
+            return None
+        try:
+            response = await self.async_transport.post(
+                api_url, self.provider, headers=self.headers, json={**payload, "model": model_name},
+                labels=self._metric_labels(num_return_sequences, model_name), ctx=ctx,
+            )
+            with span(ctx, "parse", model=model_name, hedged=hedged):
+                return self._handle_response(response, num_return_sequences, estimated, model_name)
+        except Exception as e:
+            return [f"❌ Error: {str(e)}"]
+
+    def stream_paraphrase(self, text, num_return_sequences=3, stats=None, ctx=None):
+        """
+        Streams the completion as token deltas using Groq's server-sent events.
+        Join the yielded pieces and pass them to split_variants() to get the
+        same list paraphrase() returns.
+
+        Args:
+            text (str): Input text
+            num_return_sequences (int): Number of variants requested
+            stats (dict): Optional dict filled with 'queue_ms', 'ttft_ms', 'total_ms'
+                and, on failure, 'error'
+            ctx (RequestContext): Optional trace; the SSE body is one 'stream_receive' span
+
+        Yields:
+            str: Content deltas (or a single error string)
+        """
+        stats = stats if stats is not None else {}
+        if not text.strip():
+            stats["error"] = "⚠️ Please provide valid text."
+            yield stats["error"]
+            return
+
+        # JSON mode can't stream readable text, so the stream always asks for plain lines
+        payload = self._build_payload(text, num_return_sequences, json_mode=False)
+        payload["stream"] = True
+        estimated = self._estimate_request_tokens(payload)
+        # Streams are routed to the fastest healthy model but not hedged
+        model = self.router.pick()[0] if self.router is not None else None
+        model_name, api_url = self._target(model)
+        error = self._check_window(estimated, model_name)
+        if error:
+            stats["error"] = error
+            yield error
+            return
+
+        start = time.perf_counter()
+        usage = None
+        receive_started = None
+        stats["model"] = model_name
+        try:
+            with span(ctx, "queue", kind="rate_limit", estimated_tokens=estimated):
+                stats["queue_ms"] = self.rate_limiter.acquire(estimated) * 1000
+            sent = time.perf_counter()
+            response = self.transport.post(
+                api_url, headers=self.headers, json={**payload, "model": model_name}, stream=True,
+                labels=self._metric_labels(num_return_sequences, model_name), ctx=ctx,
+            )
+            receive_started = time.perf_counter()
+            with response:
+                if response.status_code != 200:
+                    stats["error"] = f"❌ API Error {response.status_code}: {response.text}"
+                    yield stats["error"]
+                    return
+
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    # Groq reports usage on the final chunk under 'x_groq'
+                    usage = chunk.get("usage") or chunk.get("x_groq", {}).get("usage") or usage
+                    choices = chunk.get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                    if not delta:
+                        continue
+                    if "ttft_ms" not in stats:
+                        stats["ttft_ms"] = (time.perf_counter() - start) * 1000
+                    yield delta
+        except Exception as e:
+            stats["error"] = f"❌ Error: {str(e)}"
+            yield stats["error"]
+        finally:
+            stats["total_ms"] = (time.perf_counter() - start) * 1000
+            if ctx is not None and receive_started is not None:
+                # Recorded by hand: the body is consumed across yields
+                ctx.add_span("stream_receive", receive_started, ttft_ms=stats.get("ttft_ms"))
+            if model is not None and receive_started is not None:
+                self.router.record(model, time.perf_counter() - sent, not stats.get("error"))
+            if usage:
+                self._record_usage(estimated, usage, model_name)
+
+    @staticmethod
+    def split_variants(text_response, num_return_sequences):
+        """
+        Splits a completion into its distinct paraphrases (one per line),
+        skipping intro lines ("Here are 3 variations:") and stripping numbering.
+        """
+        variants = []
+        for line in iter_lines(text_response):
+            if line.endswith(":"):
+                continue
+            # Models number or bullet their variants: "1.", "2)", "-", "•"
+            variants.append(strip_bullet(line).strip().strip('"'))
+        return [variant for variant in variants if variant][:num_return_sequences]
+
+    @classmethod
+    def parse_variants(cls, content, num_return_sequences):
+        """
+        Reads {"variants": [...]} from a JSON-mode completion. Falls back to
+        the complete strings of a truncated array, then to line splitting,
+        so a bad parse never costs another request. Valid JSON without any
+        variants is an error (its text is not a paraphrase).
+        """
+        try:
+            data = json.loads(content)
+        except ValueError:
+            pass
+        else:
+            if isinstance(data, dict):
+                data = data.get("variants")
+            variants = [str(item).strip() for item in data if str(item).strip()] if isinstance(data, list) else []
+            if not variants:
+                return ["❌ Error: The model returned no paraphrases."]
+            return variants[:num_return_sequences]
+
+        # Cut off at max_tokens: keep the variants that were fully written
+        _, _, array = content.partition("[")
+        if array:
+            variants = []
+            for match in _JSON_STRING_RE.finditer(array):
+                try:
+                    variant = json.loads(f'"{match.group(1)}"').strip()
+                except ValueError:
+                    continue
+                if variant:
+                    variants.append(variant)
+            if variants:
+                return variants[:num_return_sequences]
+        return cls.split_variants(content, num_return_sequences)
+
+    def _completion_budget(self, text, num_return_sequences):
+        """
+        max_tokens for N paraphrases of text: each variant is about as long as
+        the input, plus headroom and a little JSON framing per variant.
+        """
+        per_variant = estimate_tokens(text) * self.token_headroom + 8
+        budget = math.ceil(per_variant * num_return_sequences) + 16
+        return max(self.min_completion_tokens, min(self.max_completion_tokens, budget))
+
+    def _build_payload(self, text, num_return_sequences, json_mode=None):
+        """
+        Builds the chat-completions payload asking for N paraphrases.
+        """
+        json_mode = self.json_mode if json_mode is None else json_mode
         prompt = (
             f"Paraphrase the following text into {num_return_sequences} distinct, natural, "
-            f"and fluent English variations:\n\n{text}"
+            f"and fluent English variations"
         )
+        if json_mode:
+            prompt += (
+                f'. Respond with a JSON object of the form {{"variants": ["...", ...]}} '
+                f"containing exactly {num_return_sequences} strings and nothing else"
+            )
+        else:
+            prompt += ", one per line, without numbering or any introduction"
+        prompt += f":\n\n{text}"
 
         payload = {
             "model": self.model_name,
@@ -50,24 +333,94 @@ class GroqRewriter:
                 },
                 {"role": "user", "content": prompt}
             ],
-            "temperature": 0.9,
-            "max_tokens": 400
+            **self.sampling_params,
+            "max_tokens": self._completion_budget(text, num_return_sequences),
         }
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
 
-        try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=60)
+    def _estimate_request_tokens(self, payload):
+        """
+        Tokens the request may consume: prompt estimate plus the full completion budget.
+        """
+        prompt_tokens = sum(estimate_tokens(message["content"]) for message in payload["messages"])
+        return prompt_tokens + payload.get("max_tokens", 0)
 
-            if response.status_code == 200:
-                data = response.json()
-                text_response = data["choices"][0]["message"]["content"]
-                # Split into distinct paraphrases
-                lines = [line.strip() for line in text_response.split("\n") if line.strip()]
-                return lines[:num_return_sequences]
-            else:
-                return [f"❌ API Error {response.status_code}: {response.text}"]
+    def _target(self, model):
+        """
+        (model_name, api_url) for a routed ModelEndpoint, or the defaults.
+        """
+        if model is None:
+            return self.model_name, self.api_url
+        return model.name, model.api_url
 
-        except Exception as e:
-            return [f"❌ Error: {str(e)}"]
+    @staticmethod
+    def _failed(variants):
+        return not variants or variants[0].startswith(("⚠️", "❌"))
+
+    def _check_window(self, estimated_tokens, model_name=None):
+        """
+        Rejects requests that can't fit the model's context window before they are sent.
+        model_name is the routed model; defaults to the configured one.
+        """
+        model_name = model_name or self.model_name
+        window = model_window(model_name, default=8192)
+        if estimated_tokens > window:
+            return (
+                f"⚠️ Text is too long to paraphrase (~{estimated_tokens} tokens with the reply; "
+                f"{model_name} accepts {window})."
+            )
+        return None
+
+    def _widest_model(self):
+        """
+        The routable model with the largest context window (the configured one without a router).
+        """
+        if self.router is None:
+            return self.model_name
+        return max((model.name for model in self.router.models), key=lambda name: model_window(name, default=8192))
+
+    @staticmethod
+    def _usage_tokens(usage):
+        """
+        Total tokens billed for a completion, from the response 'usage' field.
+        """
+        if not usage:
+            return None
+        if usage.get("total_tokens") is not None:
+            return usage["total_tokens"]
+        return usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+
+    def _record_usage(self, estimated_tokens, usage, model_name=None):
+        """
+        Reconciles the rate limiter and records prompt/completion token counts.
+        """
+        if not usage:
+            return
+        self.rate_limiter.reconcile(estimated_tokens, self._usage_tokens(usage))
+        for kind in ("prompt", "completion"):
+            if usage.get(f"{kind}_tokens") is not None:
+                metrics.GROQ_TOKENS.inc(usage[f"{kind}_tokens"], model=model_name or self.model_name, kind=kind)
+
+    def _metric_labels(self, num_return_sequences, model_name=None):
+        return {"backend": self.backend, "model": model_name or self.model_name, "length": num_return_sequences}
+
+    def _handle_response(self, response, num_return_sequences, estimated_tokens=None, model_name=None):
+        """
+        Turns an upstream response (requests or httpx) into a list of paraphrases.
+        """
+        if response.status_code == 200:
+            data = response.json()
+            if estimated_tokens is not None:
+                self._record_usage(estimated_tokens, data.get("usage"), model_name)
+            text_response = data["choices"][0]["message"]["content"]
+            if self.json_mode:
+                return self.parse_variants(text_response, num_return_sequences)
+            # Split into distinct paraphrases
+            return self.split_variants(text_response, num_return_sequences)
+        else:
+            return [f"❌ API Error {response.status_code}: {response.text}"]
 
 
 if __name__ == "__main__":
@@ -1,59 +1,357 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import requests
-from .groq_rewriter import GroqRewriter
+from .transport import HTTPTransport, AsyncHTTPTransport
+from .budget import plan_summary
+from .cache import is_cacheable, make_cache_key
+from .chunker import chunk_text, iter_chunks, stable_chunks
+from .tokens import model_window, truncate_to_tokens
+from .tracing import span
 
 class HFSummarizer:
     """ Manages abstractive summarization by calling the Hugging Face API. """
-    def __init__(self, api_key):
+    provider = "huggingface"
+    backend = "abstractive"
+
+    def __init__(self, api_key, transport=None, async_transport=None,
+                 max_input_tokens=900, chunk_workers=4, chunk_length='medium', max_reduce_depth=3,
+                 base_url="https://api-inference.huggingface.co/models", partial_cache=None, target_tokens=None):
         self.api_key = api_key
-        self.api_url = "https://api-inference.huggingface.co/models/facebook/bart-large-cnn"
+        self.model_name = "facebook/bart-large-cnn"
+        self.api_url = f"{base_url}/{self.model_name}"
+        self.sampling_params = {"do_sample": True, "temperature": 0.7, "top_p": 0.9}
         self.headers = {"Authorization": f"Bearer {api_key}"}
+        # Shared pooled transport (owned by ParaGlowProcessor); standalone use gets its own
+        self.transport = transport or HTTPTransport()
+        self.async_transport = async_transport or AsyncHTTPTransport()
+
+        # --- Long-document (map-reduce) settings ---
+        # bart-large-cnn has a ~1024 token window; keep headroom for special tokens
+        self.max_input_tokens = min(max_input_tokens, model_window(self.model_name) - 24)
+        self.chunk_workers = chunk_workers
+        self.chunk_length = chunk_length
+        self.max_reduce_depth = max_reduce_depth
+        # --- Incremental mode ---
+        # With a partial_cache, the map stage uses content-defined chunks and
+        # reuses each chunk's partial summary, so an edited resubmission only
+        # sends the changed chunks (plus the reduce) upstream
+        self.partial_cache = partial_cache
+        self.target_tokens = target_tokens
+        self._pool = None
+        self._pool_lock = threading.Lock()
 
-    def summarize(self, text, length='medium'):
+    def summarize(self, text, length='medium', ctx=None, progress=None):
         """
         Generate abstractive summary from text.
+        Inputs larger than the model window are summarized chunk by chunk
+        in parallel (map) and the partial summaries are summarized again (reduce).
         
         Args:
             text (str): Input text to summarize
             length (str): 'short', 'medium', or 'long'
+            ctx (RequestContext): Optional trace for chunking/queue/HTTP/parse spans
+            progress (callable): Optional progress(done=, total=) hook; total grows
+                as chunks are planned (map, then each reduce level), done as calls finish
             
         Returns:
             str: Generated summary
         """
-        length_map = {
-            'short': {"max_length": 60, "min_length": 30},
-            'medium': {"max_length": 130, "min_length": 60},
-            'long': {"max_length": 200, "min_length": 130}
-        }
-        
-        params = length_map.get(length, length_map['medium'])
-        payload = {
-            "inputs": text,
-            "parameters": {
-                **params,
-                "do_sample": True,
-                "temperature": 0.7,
-                "top_p": 0.9
-            }
-        }
+        return self._summarize(text, length, depth=0, ctx=ctx, progress=progress)
+
+    def _summarize(self, text, length, depth, ctx=None, progress=None):
+        budget = self._plan(text, length, depth, ctx)
+        if budget.action != "chunk" or depth >= self.max_reduce_depth:
+            if progress:
+                progress(total=1)
+            summary = self._summarize_chunk(text, length, ctx, budget)
+            if progress:
+                progress(done=1)
+            return summary
+
+        with span(ctx, "chunk", depth=depth) as attrs:
+            chunks = self._split(text, depth)
+            attrs["chunks"] = len(chunks)
+        partials, keys = self._reuse_partials(chunks, depth, ctx)
+        todo = [i for i, partial in enumerate(partials) if partial is None]
+        if progress:
+            progress(total=len(todo))
+        submitted = time.perf_counter()
+
+        def run(chunk):
+            # Time spent waiting for a free worker in the shared pool
+            if ctx is not None:
+                ctx.add_span("queue", submitted, kind="chunk_pool", depth=depth)
+            partial = self._summarize_chunk(chunk, self.chunk_length, ctx)
+            if progress:
+                progress(done=1)
+            return partial
+
+        # Map: every chunk goes upstream at once, bounded by the shared worker pool
+        for i, partial in zip(todo, self._get_pool().map(run, [chunks[i] for i in todo])):
+            partials[i] = partial
+        self._remember_partials(keys, todo, partials)
+        error = self._first_error(partials)
+        if error:
+            return error
+        # Reduce: recurse until the joined partial summaries fit in one window
+        return self._summarize(" ".join(partials), length, depth + 1, ctx, progress)
+
+    def summarize_pages(self, pages, length='medium', ctx=None, progress=None):
+        """
+        Summarizes a document that arrives piece by piece (e.g. pages as they
+        are parsed). Each chunk is sent upstream as soon as it fills, while
+        later pages are still being read; the partial summaries are then
+        reduced as in summarize(). A document that fits in one chunk gets a
+        single call at the requested length.
+
+        Args:
+            pages (Iterable[str]): Document text in order
+            length (str): 'short', 'medium', or 'long'
+            ctx (RequestContext): Optional trace
+            progress (callable): Optional progress(done=, total=) hook
+
+        Returns:
+            str: Generated summary
+        """
+        pool = self._get_pool()
+        futures = []
+        keys = []
+
+        def run(chunk, submitted):
+            if ctx is not None:
+                ctx.add_span("queue", submitted, kind="chunk_pool", depth=0)
+            partial = self._summarize_chunk(chunk, self.chunk_length, ctx)
+            if progress:
+                progress(done=1)
+            return partial
+
+        def submit(chunk):
+            key = self._partial_key(chunk)
+            keys.append(key)
+            cached = self.partial_cache.get(key) if key else None
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+                futures.append(future)
+                return
+            if progress:
+                progress(total=1)
+            futures.append(pool.submit(run, chunk, time.perf_counter()))
+
+        # The first chunk waits until a second one shows the document needs map-reduce
+        first = None
+        target = self._target() if self.partial_cache is not None else None
+        for chunk in iter_chunks(pages, self.max_input_tokens, target):
+            if first is None and not futures:
+                first = chunk
+                continue
+            if first is not None:
+                submit(first)
+                first = None
+            submit(chunk)
+
+        if not futures:
+            if first is None:
+                return "⚠️ No text found in the document."
+            return self._summarize(first, length, depth=0, ctx=ctx, progress=progress)
+        partials = [future.result() for future in futures]
+        self._remember_partials(keys, range(len(partials)), partials)
+        error = self._first_error(partials)
+        if error:
+            return error
+        return self._summarize(" ".join(partials), length, depth=1, ctx=ctx, progress=progress)
+
+    def _summarize_chunk(self, text, length, ctx=None, budget=None):
+        """
+        One upstream call for text that fits the model window.
+        """
+        text, budget = self._fit(text, length, budget)
+        if budget.action == "passthrough":
+            return text.strip()
+        payload = self._build_payload(text, budget)
 
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=60)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    return result[0].get("summary_text", "No summary generated")
-                else:
-                    return str(result)
-            elif response.status_code == 503:
-                return "⚠️ Model is loading. Please try again in a few moments."
-            else:
-                return f"❌ API Error: {response.status_code} - {response.text}"
+            response = self.transport.post(
+                self.api_url, headers=self.headers, json=payload, labels=self._metric_labels(length), ctx=ctx
+            )
+            with span(ctx, "parse"):
+                return self._handle_response(response)
+        except requests.exceptions.Timeout:
+            return "❌ Request timeout. Please try again."
+        except Exception as e:
+            return f"❌ Error: {str(e)}"
+
+    async def asummarize(self, text, length='medium', ctx=None, progress=None):
+        """
+        Async version of summarize(); shares the payload and response handling.
+        """
+        return await self._asummarize(text, length, depth=0, ctx=ctx, progress=progress)
+
+    async def _asummarize(self, text, length, depth, ctx=None, progress=None):
+        budget = self._plan(text, length, depth, ctx)
+        if budget.action != "chunk" or depth >= self.max_reduce_depth:
+            if progress:
+                progress(total=1)
+            summary = await self._asummarize_chunk(text, length, ctx, budget)
+            if progress:
+                progress(done=1)
+            return summary
+
+        with span(ctx, "chunk", depth=depth) as attrs:
+            chunks = self._split(text, depth)
+            attrs["chunks"] = len(chunks)
+        partials, keys = self._reuse_partials(chunks, depth, ctx)
+        todo = [i for i, partial in enumerate(partials) if partial is None]
+        if progress:
+            progress(total=len(todo))
+
+        async def run(chunk):
+            partial = await self._asummarize_chunk(chunk, self.chunk_length, ctx)
+            if progress:
+                progress(done=1)
+            return partial
+
+        # Concurrency is capped by the async transport's per-provider semaphore
+        for i, partial in zip(todo, await asyncio.gather(*(run(chunks[i]) for i in todo))):
+            partials[i] = partial
+        self._remember_partials(keys, todo, partials)
+        error = self._first_error(partials)
+        if error:
+            return error
+        return await self._asummarize(" ".join(partials), length, depth + 1, ctx, progress)
+
+    async def _asummarize_chunk(self, text, length, ctx=None, budget=None):
+        text, budget = self._fit(text, length, budget)
+        if budget.action == "passthrough":
+            return text.strip()
+        payload = self._build_payload(text, budget)
+
+        try:
+            response = await self.async_transport.post(
+                self.api_url, self.provider, headers=self.headers, json=payload,
+                labels=self._metric_labels(length), ctx=ctx,
+            )
+            with span(ctx, "parse"):
+                return self._handle_response(response)
         except requests.exceptions.Timeout:
             return "❌ Request timeout. Please try again."
         except Exception as e:
             return f"❌ Error: {str(e)}"
 
+    def _get_pool(self):
+        """
+        Lazily creates the worker pool used for the map stage (shared by all sessions).
+        """
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.chunk_workers, thread_name_prefix="hf-chunk"
+                    )
+        return self._pool
+
+    # -------- Incremental map stage --------
+    def _target(self):
+        return self.target_tokens or self.max_input_tokens * 3 // 4
+
+    def _split(self, text, depth):
+        """
+        Chunks for one map/reduce level: content-defined (stable across edits)
+        in incremental mode, greedy otherwise.
+        """
+        if self.partial_cache is not None:
+            return stable_chunks(text, self.max_input_tokens, self._target())
+        return chunk_text(text, self.max_input_tokens)
+
+    def _partial_key(self, chunk):
+        if self.partial_cache is None:
+            return None
+        return make_cache_key(chunk, "abstractive-chunk", self.model_name, self.chunk_length, self.sampling_params)
+
+    def _reuse_partials(self, chunks, depth, ctx=None):
+        """
+        Returns (partials, keys): cached partial summaries (None where a chunk
+        still has to be summarized) and the chunks' cache keys (None when
+        incremental mode is off). Intermediate reduce levels are reused too:
+        their input only changes around the re-summarized chunks.
+        """
+        if self.partial_cache is None:
+            return [None] * len(chunks), None
+        with span(ctx, "partial_cache", depth=depth) as attrs:
+            keys = [self._partial_key(chunk) for chunk in chunks]
+            partials = [self.partial_cache.get(key) for key in keys]
+            attrs["hits"] = sum(partial is not None for partial in partials)
+            attrs["misses"] = len(chunks) - attrs["hits"]
+        return partials, keys
+
+    def _remember_partials(self, keys, indices, partials):
+        if self.partial_cache is None or not keys:
+            return
+        for i in indices:
+            if is_cacheable(partials[i]):
+                self.partial_cache.set(keys[i], partials[i])
+
+    def _plan(self, text, length, depth, ctx=None):
+        """
+        Decides passthrough / single request / map-reduce before anything is sent.
+        """
+        with span(ctx, "budget", depth=depth) as attrs:
+            budget = plan_summary(text, length, self.max_input_tokens)
+            attrs.update(budget.as_dict())
+        return budget
+
+    def _fit(self, text, length, budget=None):
+        """
+        Returns (text, budget) for a single request. Input still over the window
+        (past max_reduce_depth) is truncated rather than sent to fail upstream.
+        """
+        if budget is None:
+            budget = plan_summary(text, length, self.max_input_tokens)
+        if budget.action == "chunk":
+            text = truncate_to_tokens(text, self.max_input_tokens)
+            budget = plan_summary(text, length, self.max_input_tokens)
+        return text, budget
+
+    @staticmethod
+    def _first_error(partials):
+        for partial in partials:
+            if partial.startswith(("⚠️", "❌")):
+                return partial
+        return None
+
+    def _metric_labels(self, length):
+        return {"backend": self.backend, "model": self.model_name, "length": length}
+
+    def _build_payload(self, text, budget):
+        """
+        Builds the inference payload with the length preset scaled to the input.
+        """
+        return {
+            "inputs": text,
+            "parameters": {
+                **budget.parameters,
+                **self.sampling_params
+            }
+        }
+
+    def _handle_response(self, response):
+        """
+        Turns an upstream response (requests or httpx) into a summary or error string.
+        """
+        if response.status_code == 200:
+            result = response.json()
+            if isinstance(result, list) and len(result) > 0:
+                return result[0].get("summary_text", "No summary generated")
+            else:
+                return str(result)
+        elif response.status_code == 503:
+            return "⚠️ Model is loading. Please try again in a few moments."
+        else:
+            return f"❌ API Error: {response.status_code} - {response.text}"
+
 if __name__ == "__main__":
     import os
     from dotenv import load_dotenv
@@ -0,0 +1,212 @@
+# src/mvp/ingest.py
+import io
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Formats accepted by the ingestion stage (file extension -> page reader)
+SUPPORTED_TYPES = ("pdf", "docx", "txt", "md")
+
+
+class IngestError(Exception):
+    """
+    Raised when a document cannot be read (unsupported type, missing parser, corrupt file).
+    """
+
+
+class Page:
+    """
+    One extracted page: 1-based number, text and the time spent parsing it.
+    """
+
+    def __init__(self, number, text, parse_ms):
+        self.number = number
+        self.text = text
+        self.parse_ms = parse_ms
+
+    def as_dict(self):
+        return {"page": self.number, "chars": len(self.text), "parse_ms": round(self.parse_ms, 2)}
+
+
+def document_type(filename):
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if extension not in SUPPORTED_TYPES:
+        raise IngestError(f"Unsupported file type '.{extension}'. Upload one of: {', '.join(SUPPORTED_TYPES)}.")
+    return extension
+
+
+def iter_pages(data, filename, page_chars=3000):
+    """
+    Extracts a document page by page, lazily: each page is parsed only when
+    the consumer asks for it.
+
+    Args:
+        data (bytes): File content
+        filename (str): Used to pick the parser from its extension
+        page_chars (int): Page size for formats without real pages (DOCX without
+            page breaks, plain text)
+
+    Yields:
+        Page
+    """
+    kind = document_type(filename)
+    if kind == "pdf":
+        pages = _pdf_pages(data)
+    elif kind == "docx":
+        pages = _docx_pages(data, page_chars)
+    else:
+        pages = _text_pages(data, page_chars)
+
+    number = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            text = next(pages)
+        except StopIteration:
+            return
+        number += 1
+        yield Page(number, text, (time.perf_counter() - started) * 1000)
+
+
+def _pdf_pages(data):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise IngestError("Reading PDF files needs the 'pypdf' package (pip install pypdf).")
+    try:
+        reader = PdfReader(io.BytesIO(data))
+    except Exception as e:
+        raise IngestError(f"Could not open PDF: {e}")
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def _docx_pages(data, page_chars):
+    try:
+        import docx
+        from docx.oxml.ns import qn
+    except ImportError:
+        raise IngestError("Reading DOCX files needs the 'python-docx' package (pip install python-docx).")
+    try:
+        document = docx.Document(io.BytesIO(data))
+    except Exception as e:
+        raise IngestError(f"Could not open DOCX: {e}")
+
+    # DOCX has no fixed pages: split at explicit page breaks, else every ~page_chars
+    page, size = [], 0
+    for paragraph in document.paragraphs:
+        element = paragraph._p
+        breaks = any(br.get(qn("w:type")) == "page" for br in element.iter(qn("w:br")))
+        if paragraph.text:
+            page.append(paragraph.text)
+            size += len(paragraph.text)
+        if page and (breaks or size >= page_chars):
+            yield "\n".join(page)
+            page, size = [], 0
+    if page:
+        yield "\n".join(page)
+
+
+def _text_pages(data, page_chars):
+    text = data.decode("utf-8", errors="replace")
+    # Form feeds are real page breaks; otherwise cut at the paragraph nearest page_chars
+    for block in text.split("\f"):
+        start = 0
+        while start < len(block):
+            end = start + page_chars
+            if end < len(block):
+                cut = block.rfind("\n", start + page_chars // 2, end)
+                end = cut + 1 if cut > 0 else end
+            yield block[start:end]
+            start = end
+
+
+class DocumentIngestor:
+    """
+    Runs page extraction on a worker pool, off the caller's (Streamlit
+    script) thread. stream() hands pages over a bounded queue, so a consumer
+    can start summarizing early pages while later ones are still being parsed,
+    and a slow consumer applies backpressure instead of buffering the whole file.
+    """
+
+    def __init__(self, workers=2, page_queue=8, page_chars=3000, max_bytes=25 * 1024 * 1024):
+        self.workers = workers
+        self.page_queue = page_queue
+        self.page_chars = page_chars
+        self.max_bytes = max_bytes
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds an ingestor from the 'ingest' section of config.yaml.
+        """
+        config = config or {}
+        return cls(
+            workers=config.get("workers", 2),
+            page_queue=config.get("page_queue", 8),
+            page_chars=config.get("page_chars", 3000),
+            max_bytes=int(config.get("max_file_mb", 25) * 1024 * 1024),
+        )
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="paraglow-ingest")
+        return self._pool
+
+    def stream(self, data, filename, ctx=None):
+        """
+        Yields Pages in order as the worker extracts them.
+
+        Raises:
+            IngestError: Unsupported/oversized/corrupt document (raised in the caller)
+        """
+        document_type(filename)
+        if len(data) > self.max_bytes:
+            raise IngestError(f"File is larger than {self.max_bytes // (1024 * 1024)} MB.")
+
+        pages = queue.Queue(maxsize=self.page_queue)
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            # Gives up if the consumer went away, so the worker never blocks forever
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for page in iter_pages(data, filename, self.page_chars):
+                    if ctx is not None:
+                        end = time.perf_counter()
+                        ctx.add_span("parse_page", end - page.parse_ms / 1000, end, page=page.number, chars=len(page.text))
+                    if not put(page):
+                        return
+            except Exception as e:
+                put(e)
+            else:
+                put(done)
+
+        self._get_pool().submit(produce)
+        try:
+            while True:
+                item = pages.get()
+                if item is done:
+                    return
+                if isinstance(item, IngestError):
+                    raise item
+                if isinstance(item, Exception):
+                    raise IngestError(f"Could not read {filename}: {item}")
+                yield item
+        finally:
+            stop.set()
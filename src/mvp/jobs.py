@@ -0,0 +1,210 @@
+# src/mvp/jobs.py
+import itertools
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import is_cacheable
+
+
+class Job:
+    """
+    One background summarize/paraphrase call: status, progress and result.
+    `details` collects operation extras (e.g. per-page parse timing).
+    Progress counts work units (upstream calls); `total` may grow while a
+    long document moves from the map stage to each reduce level.
+    """
+    QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+    def __init__(self, job_id, operation, params):
+        self.id = job_id
+        self.operation = operation
+        self.params = params
+        self.status = self.QUEUED
+        self.done = 0
+        self.total = 0
+        self.result = None
+        self.details = {}
+        self.request_id = None
+
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def advance(self, done=0, total=0):
+        """
+        Progress hook handed to the summarizers (called from worker threads).
+        """
+        with self._lock:
+            self.done += done
+            self.total += total
+
+    @property
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
+
+    @property
+    def fraction(self):
+        if self.is_finished:
+            return 1.0
+        with self._lock:
+            if not self.total:
+                return 0.0
+            return min(self.done / self.total, 0.99)
+
+    def to_dict(self):
+        now = time.time()
+        with self._lock:
+            done, total = self.done, self.total
+        return {
+            "id": self.id,
+            "operation": self.operation,
+            "status": self.status,
+            "progress": {"done": done, "total": total},
+            "request_id": self.request_id,
+            "queued_ms": round(((self.started or now) - self.created) * 1000, 1),
+            "run_ms": round(((self.finished or now) - self.started) * 1000, 1) if self.started else None,
+            "result": self.result,
+            "details": self.details,
+        }
+
+
+class JobManager:
+    """
+    Runs summarize/paraphrase calls on a worker pool so a Streamlit script run
+    only submits and polls. Jobs live in the process (next to the processor),
+    so a finished result survives reruns and can be fetched by id afterwards.
+
+    Finished jobs are kept for `ttl_seconds` and at most `max_jobs` of them;
+    submissions beyond `max_pending` queued/running jobs fail fast.
+    """
+
+    OPERATIONS = ("summarize", "summarize_document", "paraphrase")
+
+    def __init__(self, processor, workers=2, max_pending=32, max_jobs=256, ttl_seconds=3600):
+        self.processor = processor
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+
+        self._jobs = {}  # insertion-ordered: oldest first
+        self._pending = 0
+        self._counters = {"submitted": 0, "rejected": 0, "done": 0, "failed": 0, "evicted": 0}
+        self._sequence = itertools.count(1)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, processor, config):
+        """
+        Builds a manager from the 'jobs' section of config.yaml.
+        """
+        config = config or {}
+        return cls(
+            processor,
+            workers=config.get("workers", 2),
+            max_pending=config.get("max_pending", 32),
+            max_jobs=config.get("max_jobs", 256),
+            ttl_seconds=config.get("ttl_seconds", 3600),
+        )
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="paraglow-job")
+        return self._pool
+
+    def submit(self, operation, text, ctx=None, **params):
+        """
+        Queues processor.<operation>(text, **params) and returns the job id at once.
+
+        Args:
+            operation (str): 'summarize', 'summarize_document' or 'paraphrase'
+            text (str | bytes): Input text (file content for summarize_document)
+            ctx (RequestContext): Optional trace, finished by the processor when the job ends
+            **params: method/length for summarize (plus filename for documents),
+                num_return_sequences for paraphrase
+
+        Returns:
+            str: Job id (check it with get()); a full queue yields a job that has already failed
+        """
+        if operation not in self.OPERATIONS:
+            raise ValueError(f"Unknown job operation: {operation}")
+        job = Job(f"{next(self._sequence):06d}-{uuid.uuid4().hex[:8]}", operation, params)
+        if ctx is not None:
+            job.request_id = ctx.request_id
+
+        with self._lock:
+            self._evict(time.time())
+            self._jobs[job.id] = job
+            if self._pending >= self.max_pending:
+                self._counters["rejected"] += 1
+                job.status, job.result = Job.FAILED, "⚠️ Too many jobs queued. Please try again shortly."
+                job.finished = time.time()
+                return job.id
+            self._pending += 1
+            self._counters["submitted"] += 1
+
+        self._get_pool().submit(self._run, job, text, ctx)
+        return job.id
+
+    def _run(self, job, text, ctx):
+        job.started = time.time()
+        job.status = Job.RUNNING
+        try:
+            if job.operation == "summarize":
+                result = self.processor.summarize(text, ctx=ctx, progress=job.advance, **job.params)
+            elif job.operation == "summarize_document":
+                result = self.processor.summarize_document(
+                    text, ctx=ctx, progress=job.advance, stats=job.details, **job.params
+                )
+            else:
+                job.advance(total=1)
+                result = self.processor.paraphrase(text, ctx=ctx, **job.params)
+                job.advance(done=1)
+        except Exception as e:
+            result = f"❌ Error: {e}"
+
+        status = Job.DONE if is_cacheable(result) else Job.FAILED
+        with self._lock:
+            job.result = result
+            job.finished = time.time()
+            # Set last: pollers read the result once the status says it is there
+            job.status = status
+            self._pending -= 1
+            self._counters[status] += 1
+
+    def get(self, job_id):
+        """
+        Returns the Job, or None if the id is unknown or already evicted.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _evict(self, now):
+        """
+        Drops expired finished jobs, then the oldest finished ones over max_jobs.
+        Caller holds the lock.
+        """
+        finished = [job for job in self._jobs.values() if job.is_finished]
+        overflow = len(self._jobs) - self.max_jobs
+        for job in finished:
+            if now - job.finished >= self.ttl_seconds or overflow > 0:
+                del self._jobs[job.id]
+                self._counters["evicted"] += 1
+                overflow -= 1
+
+    def stats(self):
+        """
+        Job counters plus current queue depth.
+        """
+        with self._lock:
+            return {**self._counters, "pending": self._pending, "stored": len(self._jobs), "workers": self.workers}
+
+    def shutdown(self, wait=False):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
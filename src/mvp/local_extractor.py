@@ -0,0 +1,179 @@
+# src/mvp/local_extractor.py
+import asyncio
+import math
+import re
+
+import numpy as np
+
+from .segment import split_sentences
+from .tracing import span
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Small built-in stopword list so ranking focuses on content words
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most
+my myself no nor not now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there these they this those
+through to too under until up very was we were what when where which while who whom why will with
+would you your yours yourself yourselves also may might must shall
+""".split())
+
+
+class LocalTextExtractor:
+    """
+    Extractive summarizer that runs entirely on the local CPU.
+    Builds a sparse TF-IDF sentence matrix with NumPy, ranks sentences with
+    TextRank (or similarity to the document centroid) and returns the
+    top-ranked ones in their original order. No network, no model loading.
+    """
+    provider = "local"
+
+    # Fraction of sentences to keep and the minimum kept, per length preset
+    length_map = {
+        'short': {"ratio": 0.15, "min_sentences": 2},
+        'medium': {"ratio": 0.3, "min_sentences": 3},
+        'long': {"ratio": 0.45, "min_sentences": 5},
+    }
+
+    def __init__(self, ranking="textrank", damping=0.85, max_iterations=50, tolerance=1e-6):
+        self.ranking = ranking
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+        self.model_name = f"local-{ranking}"
+        self.sampling_params = {}
+
+    def summarize(self, text, length='medium', ctx=None, progress=None):
+        """
+        Generate extractive summary from text.
+        Runs in one step, so `progress` is accepted for interface parity only.
+        """
+        with span(ctx, "segment") as attrs:
+            sentences = split_sentences(text)
+            attrs["sentences"] = len(sentences)
+        if not sentences:
+            return "⚠️ No sentences found to summarize."
+
+        preset = self.length_map.get(length, self.length_map['medium'])
+        keep = max(preset["min_sentences"], math.ceil(preset["ratio"] * len(sentences)))
+        if keep >= len(sentences):
+            return " ".join(sentences)
+
+        with span(ctx, "rank", ranking=self.ranking):
+            matrix = self._tfidf_matrix(sentences)
+            if self.ranking == "centroid":
+                scores = self._centroid_scores(matrix)
+            else:
+                scores = self._textrank_scores(matrix)
+
+        # Highest scores first, then restore document order for readability
+        top = np.sort(np.argsort(-scores, kind="stable")[:keep])
+        return " ".join(sentences[i] for i in top)
+
+    async def asummarize(self, text, length='medium', ctx=None, progress=None):
+        """
+        Same as summarize(), run on a worker thread: ranking a large input is
+        CPU-bound and would otherwise block the event loop (and every other
+        in-flight API request) for its whole duration.
+        """
+        return await asyncio.to_thread(self.summarize, text, length, ctx)
+
+    def _tfidf_matrix(self, sentences):
+        """
+        Returns an L2-normalized (sentences x vocabulary) TF-IDF matrix in
+        sparse form: only the non-zero entries are stored.
+        """
+        vocabulary = {}
+        rows, cols = [], []
+        for row, sentence in enumerate(sentences):
+            for word in _WORD_RE.findall(sentence.lower()):
+                if word in STOPWORDS:
+                    continue
+                rows.append(row)
+                cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+        n, size = len(sentences), max(len(vocabulary), 1)
+        if not rows:
+            return TermMatrix(n, size, np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.float32))
+
+        # One entry per (sentence, term) pair with its count
+        pairs, counts = np.unique(np.asarray(rows, np.int64) * size + np.asarray(cols, np.int64), return_counts=True)
+        rows, cols = pairs // size, pairs % size
+
+        document_frequency = np.bincount(cols, minlength=size)
+        idf = np.log((1.0 + n) / (1.0 + document_frequency)) + 1.0
+        data = (np.log1p(counts) * idf[cols]).astype(np.float32)
+
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=n))
+        norms[norms == 0] = 1.0
+        return TermMatrix(n, size, rows, cols, (data / norms[rows]).astype(np.float32))
+
+    def _textrank_scores(self, matrix):
+        """
+        PageRank over the sentence cosine-similarity graph (power iteration).
+        The n x n similarity matrix S = M M^T (diagonal removed) is never
+        built: S @ x is computed as M @ (M^T @ x) minus the diagonal, so each
+        iteration costs two sparse products.
+        """
+        n = matrix.shape[0]
+        diagonal = matrix.row_norms_squared()
+
+        def similarity_dot(x):
+            return matrix.dot(matrix.tdot(x)) - diagonal * x
+
+        row_sums = similarity_dot(np.ones(n, dtype=np.float32))
+        row_sums[row_sums <= 0] = 1.0
+
+        scores = np.full(n, 1.0 / n, dtype=np.float32)
+        teleport = (1.0 - self.damping) / n
+        for _ in range(self.max_iterations):
+            # S is symmetric, so transition.T @ scores == S @ (scores / row_sums)
+            updated = teleport + self.damping * similarity_dot(scores / row_sums)
+            if np.abs(updated - scores).sum() < self.tolerance:
+                return updated
+            scores = updated
+        return scores
+
+    def _centroid_scores(self, matrix):
+        """
+        Cosine similarity of each sentence to the document centroid.
+        """
+        n = matrix.shape[0]
+        centroid = matrix.tdot(np.full(n, 1.0 / n, dtype=np.float32))
+        norm = np.linalg.norm(centroid)
+        if norm == 0:
+            return np.zeros(n, dtype=np.float32)
+        return matrix.dot(centroid / norm)
+
+
+class TermMatrix:
+    """
+    Minimal sparse (coordinate format) matrix for the TF-IDF ranking: stores
+    only the non-zero (row, col, value) entries, so memory and every product
+    scale with the number of words rather than sentences x vocabulary.
+    """
+
+    def __init__(self, n_rows, n_cols, rows, cols, data):
+        self.shape = (n_rows, n_cols)
+        self.rows = rows
+        self.cols = cols
+        self.data = data
+
+    def dot(self, vector):
+        """
+        M @ vector (vector over columns).
+        """
+        return np.bincount(self.rows, weights=self.data * vector[self.cols], minlength=self.shape[0]).astype(np.float32)
+
+    def tdot(self, vector):
+        """
+        M^T @ vector (vector over rows).
+        """
+        return np.bincount(self.cols, weights=self.data * vector[self.rows], minlength=self.shape[1]).astype(np.float32)
+
+    def row_norms_squared(self):
+        return np.bincount(self.rows, weights=self.data * self.data, minlength=self.shape[0]).astype(np.float32)
@@ -0,0 +1,250 @@
+# src/mvp/metrics.py
+import json
+import math
+import threading
+
+# Seconds; spans a cached hit (~ms) up to a slow model cold start
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Bytes; request/response payload sizes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _label_key(labelnames, labels):
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _format_labels(labelnames, key, extra=None):
+    pairs = list(zip(labelnames, key)) + list(extra or [])
+    if not pairs:
+        return ""
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class Counter:
+    """
+    Monotonic counter with labels.
+    """
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+    def snapshot(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [{"labels": dict(zip(self.labelnames, key)), "value": value} for key, value in items]
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with labels; snapshots include
+    p50/p95/p99 estimated by interpolating within buckets.
+    """
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # key -> [bucket counts..., +Inf count], sum, count
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            index = len(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    index = i
+                    break
+            series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def _quantile(self, counts, total, q):
+        if total == 0:
+            return None
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for i, count in enumerate(counts):
+            upper = self.buckets[i] if i < len(self.buckets) else math.inf
+            if cumulative + count >= rank:
+                if upper == math.inf:
+                    return lower
+                fraction = (rank - cumulative) / count if count else 0.0
+                return lower + (upper - lower) * fraction
+            cumulative += count
+            lower = upper
+        return lower
+
+    def render(self):
+        with self._lock:
+            items = sorted((key, dict(series, counts=list(series["counts"]))) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series["counts"]):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {series['sum']}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {series['count']}")
+        return lines
+
+    def snapshot(self):
+        with self._lock:
+            items = sorted((key, dict(series, counts=list(series["counts"]))) for key, series in self._series.items())
+        return [
+            {
+                "labels": dict(zip(self.labelnames, key)),
+                "count": series["count"],
+                "sum": series["sum"],
+                "p50": self._quantile(series["counts"], series["count"], 0.50),
+                "p95": self._quantile(series["counts"], series["count"], 0.95),
+                "p99": self._quantile(series["counts"], series["count"], 0.99),
+            }
+            for key, series in items
+        ]
+
+
+class MetricsRegistry:
+    """
+    In-process metrics registry. Renders Prometheus text exposition
+    format or a JSON-friendly snapshot.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render_prometheus(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: {"type": metric.kind, "series": metric.snapshot()} for metric in metrics}
+
+    def render_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+
+# Process-wide registry shared by the processor, clients and transports
+registry = MetricsRegistry()
+
+UPSTREAM_LATENCY = registry.histogram(
+    "paraglow_upstream_request_seconds",
+    "Upstream HTTP latency including retries.",
+    ("backend", "model", "length"),
+)
+UPSTREAM_REQUEST_BYTES = registry.histogram(
+    "paraglow_upstream_request_bytes",
+    "Serialized upstream request payload size.",
+    ("backend", "model"),
+    buckets=SIZE_BUCKETS,
+)
+UPSTREAM_RESPONSE_BYTES = registry.histogram(
+    "paraglow_upstream_response_bytes",
+    "Upstream response body size.",
+    ("backend", "model"),
+    buckets=SIZE_BUCKETS,
+)
+UPSTREAM_ERRORS = registry.counter(
+    "paraglow_upstream_errors_total",
+    "Upstream failures by error class (http_<status>, timeout, connection, circuit_open, ...).",
+    ("backend", "model", "error_class"),
+)
+GROQ_TOKENS = registry.counter(
+    "paraglow_groq_tokens_total",
+    "Tokens reported in Groq's usage field.",
+    ("model", "kind"),
+)
+REQUESTS = registry.counter(
+    "paraglow_requests_total",
+    "Processor calls by operation, backend and outcome (ok, error).",
+    ("operation", "backend", "outcome"),
+)
+REQUEST_LATENCY = registry.histogram(
+    "paraglow_request_seconds",
+    "End-to-end processor latency.",
+    ("operation", "backend", "length"),
+)
+CACHE_LOOKUPS = registry.counter(
+    "paraglow_cache_lookups_total",
+    "Result cache lookups by result (hit, miss).",
+    ("result",),
+)
+COALESCED = registry.counter(
+    "paraglow_coalesced_requests_total",
+    "Requests that shared an identical in-flight upstream call.",
+)
+HEDGES = registry.counter(
+    "paraglow_hedged_requests_total",
+    "Hedge attempts sent to a model after the first attempt passed its p95 (fired), and those that answered first (won).",
+    ("model", "result"),
+)
+API_REJECTED = registry.counter(
+    "paraglow_api_rejected_total",
+    "API requests turned away before reaching the processor (saturated, too_large, bad_request).",
+    ("endpoint", "reason"),
+)
+
+
+def error_class(error):
+    """
+    Maps an exception to a short, low-cardinality label.
+    """
+    import requests
+    from .retry import CircuitOpenError
+
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "connection"
+    return type(error).__name__
@@ -0,0 +1,176 @@
+# src/mvp/rate_limiter.py
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Continuous-refill token bucket. The balance may go negative: a caller
+    that reserves more than is available takes on 'debt' and is told how
+    long to wait, so later callers queue behind it in arrival order.
+    """
+
+    def __init__(self, capacity, per_seconds=60.0):
+        self.capacity = float(capacity)
+        self.refill_rate = self.capacity / per_seconds
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def reserve(self, amount, now):
+        """
+        Takes `amount` tokens and returns the seconds to wait until they are covered.
+        """
+        self._refill(now)
+        amount = min(float(amount), self.capacity)
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.refill_rate
+
+    def try_reserve(self, amount, now):
+        """
+        Takes `amount` tokens only if they are available right now.
+        """
+        self._refill(now)
+        amount = min(float(amount), self.capacity)
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+    def adjust(self, delta, now):
+        """
+        Gives back (positive) or charges (negative) tokens after the fact.
+        """
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+
+class RateLimiter:
+    """
+    Client-side limiter for Groq's requests-per-minute and tokens-per-minute
+    quotas. Callers queue (sleep) until both buckets cover their request
+    instead of hitting a 429. Token usage is estimated before the call and
+    reconciled with the 'usage' field of the response.
+    """
+
+    def __init__(self, requests_per_minute=30, tokens_per_minute=6000):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._lock = threading.Lock()
+
+        # --- Metrics ---
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.queued = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.reconciled_tokens = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds a limiter from the 'groq.rate_limit' section of config.yaml.
+        """
+        config = config or {}
+        return cls(
+            requests_per_minute=config.get("requests_per_minute", 30),
+            tokens_per_minute=config.get("tokens_per_minute", 6000),
+        )
+
+    def _reserve(self, estimated_tokens):
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self._requests.reserve(1, now),
+                self._tokens.reserve(estimated_tokens, now),
+            )
+            self.acquired += 1
+            self.total_wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            if wait > 0:
+                self.queued += 1
+                self.queue_depth += 1
+                self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            return wait
+
+    def _release_queue_slot(self):
+        with self._lock:
+            self.queue_depth -= 1
+
+    def acquire(self, estimated_tokens):
+        """
+        Blocks until one request and `estimated_tokens` tokens are available.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                self._release_queue_slot()
+        return wait
+
+    def try_acquire(self, estimated_tokens):
+        """
+        Non-blocking acquire for optional work (hedged requests): succeeds only
+        if both buckets cover the request without waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._requests._refill(now)
+            self._tokens._refill(now)
+            if self._requests.tokens < 1 or self._tokens.tokens < min(float(estimated_tokens), self._tokens.capacity):
+                return False
+            self._requests.try_reserve(1, now)
+            self._tokens.try_reserve(estimated_tokens, now)
+            self.acquired += 1
+            return True
+
+    async def aacquire(self, estimated_tokens):
+        """
+        Async version of acquire(); waits without blocking the event loop.
+        """
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._release_queue_slot()
+        return wait
+
+    def reconcile(self, estimated_tokens, actual_tokens):
+        """
+        Corrects the token bucket once the real usage is known.
+        """
+        if actual_tokens is None:
+            return
+        with self._lock:
+            self._tokens.adjust(estimated_tokens - actual_tokens, time.monotonic())
+            self.reconciled_tokens += actual_tokens - estimated_tokens
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "acquired": self.acquired,
+                "queued": self.queued,
+                "total_wait_seconds": round(self.total_wait_seconds, 3),
+                "max_wait_seconds": round(self.max_wait_seconds, 3),
+                "avg_wait_ms": round(1000 * self.total_wait_seconds / self.acquired, 1) if self.acquired else 0.0,
+                "reconciled_tokens": self.reconciled_tokens,
+            }
@@ -0,0 +1,349 @@
+# src/mvp/retry.py
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Upstream statuses worth another attempt (rate limited, overloaded, model loading)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def retryable_errors():
+    """
+    Transport exceptions worth another attempt. Resolved lazily so importing
+    this module does not pull in requests at startup.
+    """
+    import requests
+
+    return (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an endpoint whose circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint breaker: opens after N consecutive failures, fails fast
+    while open, and lets one trial request through after reset_timeout.
+
+    Every trial must end in record_success(), record_failure(), record_reachable()
+    or release(); a trial that never reports back (e.g. a leaked task) is
+    replaced by a new one after another reset_timeout, so the breaker can
+    never stay half-open for good.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_started = None
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Returns True if a request may be sent right now.
+        """
+        with self._lock:
+            if self._accepting(time.monotonic()):
+                if self.state != self.CLOSED:
+                    # Let a single trial request probe the upstream
+                    self.state = self.HALF_OPEN
+                    self.trial_started = time.monotonic()
+                return True
+            return False
+
+    def accepting(self):
+        """
+        True if allow() would let a request through now (without starting a trial).
+        """
+        with self._lock:
+            return self._accepting(time.monotonic())
+
+    def _accepting(self, now):
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            return now - self.opened_at >= self.reset_timeout
+        # Half-open: only if the outstanding trial has gone silent
+        return now - self.trial_started >= self.reset_timeout
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = self.trial_started = None
+
+    def record_reachable(self):
+        """
+        The endpoint answered but could not serve yet (model loading): not a
+        failure, and enough to close a half-open breaker. Failure counts are
+        kept, so one more real failure reopens it.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.CLOSED
+                self.opened_at = self.trial_started = None
+
+    def release(self):
+        """
+        The request was abandoned without an outcome (cancelled hedge loser,
+        interrupt). A half-open breaker goes back to open with its timeout
+        already elapsed, so the next request becomes the new trial.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic() - self.reset_timeout
+                self.trial_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.trial_started = None
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "accepting": self._accepting(time.monotonic()),
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+            }
+
+
+class RetryPolicy:
+    """
+    Shared retry policy for every upstream client.
+    Exponential backoff with full jitter, honoring Retry-After and
+    Hugging Face's 'estimated_time' while a model loads, bounded by a
+    total per-request deadline and guarded by a circuit breaker per endpoint.
+    """
+
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=20, deadline=90,
+                 breaker_threshold=5, breaker_reset=30):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+
+        self._breakers = {}
+        self._counters = {}  # endpoint -> {"requests", "retries", "failures", "rejected"}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds a policy from the 'retry' section of config.yaml.
+        """
+        config = config or {}
+        return cls(
+            max_attempts=config.get("max_attempts", 4),
+            base_delay=config.get("base_delay", 0.5),
+            max_delay=config.get("max_delay", 20),
+            deadline=config.get("deadline", 90),
+            breaker_threshold=config.get("breaker_threshold", 5),
+            breaker_reset=config.get("breaker_reset", 30),
+        )
+
+    def breaker_for(self, endpoint):
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+                self._breakers[endpoint] = breaker
+                self._counters[endpoint] = {"requests": 0, "retries": 0, "failures": 0, "rejected": 0}
+            return breaker
+
+    def _count(self, endpoint, name):
+        with self._lock:
+            self._counters[endpoint][name] += 1
+
+    def call(self, endpoint, send):
+        """
+        Runs send(timeout) with retries.
+
+        Args:
+            endpoint (str): Breaker/metrics key (the upstream URL)
+            send (callable): Takes the remaining deadline in seconds, returns a response
+
+        Returns:
+            The first successful or non-retryable response, or the last one once
+            retries or the deadline are exhausted.
+
+        Raises:
+            CircuitOpenError: If the endpoint's breaker is open
+        """
+        breaker = self.breaker_for(endpoint)
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self._check_breaker(endpoint, breaker)
+            remaining = self.deadline - (time.monotonic() - started)
+            self._count(endpoint, "requests")
+            try:
+                response = send(remaining)
+            except retryable_errors():
+                breaker.record_failure()
+                self._count(endpoint, "failures")
+                delay = self._next_delay(None, attempt, started)
+                if delay is None:
+                    raise
+            except Exception:
+                # Not worth retrying (e.g. a broken response body), but still a failed attempt
+                breaker.record_failure()
+                self._count(endpoint, "failures")
+                raise
+            except BaseException:
+                # Cancelled (hedge loser) or interrupted: no outcome to record
+                breaker.release()
+                raise
+            else:
+                if not self._record(breaker, endpoint, response):
+                    return response
+                delay = self._next_delay(response, attempt, started)
+                if delay is None:
+                    return response
+                response.close()
+
+            attempt += 1
+            self._count(endpoint, "retries")
+            time.sleep(delay)
+
+    async def acall(self, endpoint, send):
+        """
+        Async version of call(); send(timeout) must return an awaitable.
+        """
+        breaker = self.breaker_for(endpoint)
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self._check_breaker(endpoint, breaker)
+            remaining = self.deadline - (time.monotonic() - started)
+            self._count(endpoint, "requests")
+            try:
+                response = await send(remaining)
+            except retryable_errors():
+                breaker.record_failure()
+                self._count(endpoint, "failures")
+                delay = self._next_delay(None, attempt, started)
+                if delay is None:
+                    raise
+            except Exception:
+                # Not worth retrying (e.g. a broken response body), but still a failed attempt
+                breaker.record_failure()
+                self._count(endpoint, "failures")
+                raise
+            except BaseException:
+                # Cancelled (hedge loser) or interrupted: no outcome to record
+                breaker.release()
+                raise
+            else:
+                if not self._record(breaker, endpoint, response):
+                    return response
+                delay = self._next_delay(response, attempt, started)
+                if delay is None:
+                    return response
+
+            attempt += 1
+            self._count(endpoint, "retries")
+            await asyncio.sleep(delay)
+
+    def _check_breaker(self, endpoint, breaker):
+        if not breaker.allow():
+            self._count(endpoint, "rejected")
+            raise CircuitOpenError(f"Upstream {endpoint} is temporarily unavailable (circuit open).")
+
+    def _record(self, breaker, endpoint, response):
+        """
+        Updates the breaker from a response. Returns True if it should be retried.
+        """
+        if response.status_code not in RETRYABLE_STATUS:
+            breaker.record_success()
+            return False
+        # Rate limiting (429) and a model that is still loading are not outages;
+        # the upstream answered, so don't trip the breaker on them
+        if response.status_code == 429 or self._estimated_time(response) is not None:
+            breaker.record_reachable()
+        else:
+            breaker.record_failure()
+        self._count(endpoint, "failures")
+        return True
+
+    def _next_delay(self, response, attempt, started):
+        """
+        Returns seconds to wait before the next attempt, or None to give up.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        delay = None
+        if response is not None:
+            delay = self._retry_after(response)
+            if delay is None:
+                delay = self._estimated_time(response)
+        if delay is None:
+            # Full jitter: uniform in [0, base * 2^attempt]
+            delay = random.uniform(0, self.base_delay * (2 ** attempt))
+        delay = min(delay, self.max_delay)
+
+        remaining = self.deadline - (time.monotonic() - started)
+        if delay >= remaining:
+            return None
+        return delay
+
+    @staticmethod
+    def _retry_after(response):
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _estimated_time(response):
+        """
+        Hugging Face answers 503 with {"error": ..., "estimated_time": seconds} while a model loads.
+        """
+        if response.status_code != 503:
+            return None
+        try:
+            body = response.json()
+        except Exception:
+            return None
+        if isinstance(body, dict) and isinstance(body.get("estimated_time"), (int, float)):
+            return float(body["estimated_time"])
+        return None
+
+    def stats(self):
+        """
+        Retry counters and breaker state per endpoint.
+        """
+        with self._lock:
+            endpoints = list(self._breakers.items())
+            counters = {endpoint: dict(values) for endpoint, values in self._counters.items()}
+        return {
+            endpoint: {**counters[endpoint], "breaker": breaker.snapshot()}
+            for endpoint, breaker in endpoints
+        }
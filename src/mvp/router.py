@@ -0,0 +1,303 @@
+# src/mvp/router.py
+import asyncio
+import collections
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
+
+from . import metrics
+
+
+class ModelEndpoint:
+    """
+    One routable model: its name, endpoint and rolling latency/health stats.
+    """
+
+    def __init__(self, name, api_url, window=50):
+        self.name = name
+        self.api_url = api_url
+        self.latencies = collections.deque(maxlen=window)
+        self.ewma = None
+        self.consecutive_failures = 0
+        self.unhealthy_since = None
+
+        self.picked = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def p95(self):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class ModelRouter:
+    """
+    Routes each request to the fastest healthy model (rolling EWMA latency)
+    and hedges slow calls: if the first attempt is still running after the
+    model's p95, a second attempt goes to the next-best model (or the same
+    one if only one is configured) and the first good answer wins.
+    Extra load is capped by a hedge budget (hedge_budget x primary requests).
+
+    A model is unhealthy while its endpoint's circuit breaker rejects requests, or for
+    `cooldown` seconds after `failure_threshold` consecutive failures.
+    """
+
+    def __init__(self, models, window=50, hedge=True, hedge_quantile=0.95, hedge_budget=0.1,
+                 min_samples=10, hedge_delay_default=3.0, failure_threshold=3, cooldown=30,
+                 explore=0.05, alpha=0.2, hedge_workers=32, breaker_accepting=None):
+        if not models:
+            raise ValueError("ModelRouter needs at least one model")
+        self.models = models
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_budget = hedge_budget
+        self.min_samples = min_samples
+        self.hedge_delay_default = hedge_delay_default
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.explore = explore
+        self.alpha = alpha
+        self.hedge_workers = hedge_workers
+        # Callable(api_url) -> True if the endpoint's breaker would let a request through
+        self.breaker_accepting = breaker_accepting
+
+        # Starts with one hedge available; each primary request earns hedge_budget more
+        self._hedge_credit = 1.0
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, default_model, default_api_url, breaker_accepting=None):
+        """
+        Builds a router from the 'groq.router' section of config.yaml.
+        Models may be plain names or {name, api_url} entries.
+        """
+        config = config or {}
+        window = config.get("window", 50)
+        models = []
+        for entry in config.get("models") or [default_model]:
+            if isinstance(entry, str):
+                entry = {"name": entry}
+            models.append(ModelEndpoint(entry["name"], entry.get("api_url", default_api_url), window))
+        return cls(
+            models,
+            window=window,
+            hedge=config.get("hedge", True),
+            hedge_quantile=config.get("hedge_quantile", 0.95),
+            hedge_budget=config.get("hedge_budget", 0.1),
+            min_samples=config.get("min_samples", 10),
+            hedge_delay_default=config.get("hedge_delay_default", 3.0),
+            failure_threshold=config.get("failure_threshold", 3),
+            cooldown=config.get("cooldown", 30),
+            explore=config.get("explore", 0.05),
+            hedge_workers=config.get("hedge_workers", 32),
+            breaker_accepting=breaker_accepting,
+        )
+
+    # -------- Selection --------
+    def _healthy(self, model, now):
+        # Open with its timeout elapsed counts as healthy (the next call is the trial);
+        # half-open with a trial in flight does not
+        if self.breaker_accepting is not None and not self.breaker_accepting(model.api_url):
+            return False
+        if model.unhealthy_since is None:
+            return True
+        # After the cooldown the model gets traffic again; one more failure re-arms it
+        return now - model.unhealthy_since >= self.cooldown
+
+    def _expected(self, model):
+        # Untried models sort first so every model gets measured
+        return model.ewma if model.ewma is not None else 0.0
+
+    def pick(self):
+        """
+        Returns (primary, backup) for the next request.
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [m for m in self.models if self._healthy(m, now)] or list(self.models)
+            ranked = sorted(healthy, key=self._expected)
+            primary = ranked[0]
+            backup = ranked[1] if len(ranked) > 1 else primary
+            if len(ranked) > 1 and random.random() < self.explore:
+                # Occasionally lead with the runner-up so its estimate stays fresh
+                primary, backup = backup, primary
+            primary.picked += 1
+            self._hedge_credit = min(10.0, self._hedge_credit + self.hedge_budget)
+        return primary, backup
+
+    def hedge_delay(self, model):
+        """
+        Seconds to wait on the first attempt before hedging: the model's rolling p95.
+        """
+        with self._lock:
+            if len(model.latencies) < self.min_samples:
+                return self.hedge_delay_default
+            ordered = sorted(model.latencies)
+        return ordered[min(len(ordered) - 1, int(self.hedge_quantile * len(ordered)))]
+
+    def _take_hedge_credit(self):
+        with self._lock:
+            if self._hedge_credit < 1.0:
+                return False
+            self._hedge_credit -= 1.0
+            return True
+
+    # -------- Bookkeeping --------
+    def record(self, model, latency, ok):
+        """
+        Feeds one finished attempt into the model's latency window and health.
+        """
+        with self._lock:
+            if ok:
+                model.latencies.append(latency)
+                model.ewma = latency if model.ewma is None else self.alpha * latency + (1 - self.alpha) * model.ewma
+                model.consecutive_failures = 0
+                model.unhealthy_since = None
+            else:
+                model.consecutive_failures += 1
+                if model.consecutive_failures >= self.failure_threshold:
+                    model.unhealthy_since = time.monotonic()
+
+    def _record_hedge(self, model, won):
+        with self._lock:
+            if won:
+                model.hedges_won += 1
+            else:
+                model.hedges_fired += 1
+        metrics.HEDGES.inc(model=model.name, result="won" if won else "fired")
+
+    def _timed(self, model, send, hedged, failed):
+        started = time.perf_counter()
+        result = send(model, hedged)
+        # None means the attempt was skipped (e.g. no rate budget for a hedge)
+        if result is not None:
+            self.record(model, time.perf_counter() - started, not failed(result))
+        return result
+
+    async def _atimed(self, model, send, hedged, failed):
+        started = time.perf_counter()
+        try:
+            result = await send(model, hedged)
+        except asyncio.CancelledError:
+            # Lost the race: no answer, so no latency sample and no health change.
+            # The breaker trial (if any) is released by RetryPolicy.acall.
+            raise
+        if result is not None:
+            self.record(model, time.perf_counter() - started, not failed(result))
+        return result
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.hedge_workers, thread_name_prefix="groq-hedge")
+        return self._pool
+
+    # -------- Execution --------
+    def call(self, send, failed):
+        """
+        Runs send(model, hedged) on the best model, hedging once if it is slow.
+
+        Args:
+            send (callable): (ModelEndpoint, hedged: bool) -> result, or None if skipped
+            failed (callable): result -> True if it is an error
+
+        Returns:
+            The first successful result, else the primary's result.
+        """
+        primary, backup = self.pick()
+        if not self.hedge:
+            return self._timed(primary, send, False, failed)
+
+        started = threading.Event()
+
+        def run_primary():
+            started.set()
+            return self._timed(primary, send, False, failed)
+
+        first = self._get_pool().submit(run_primary)
+        # The hedge delay counts from when the primary starts running, not
+        # from when it was queued behind other work on the pool
+        started.wait()
+        try:
+            return first.result(timeout=self.hedge_delay(primary))
+        except FutureTimeout:
+            pass
+        if not self._take_hedge_credit():
+            return first.result()
+
+        second = self._get_pool().submit(self._timed, backup, send, True, failed)
+        self._record_hedge(backup, won=False)
+        results = {}
+        for future in as_completed((first, second)):
+            result = future.result()
+            if result is not None and not failed(result):
+                if future is second:
+                    self._record_hedge(backup, won=True)
+                return result
+            results[future] = result
+        return results[first]
+
+    async def acall(self, send, failed):
+        """
+        Async version of call(). The losing attempt is cancelled, and so are
+        both attempts if the caller is.
+        """
+        primary, backup = self.pick()
+        first = asyncio.ensure_future(self._atimed(primary, send, False, failed))
+        second = None
+        try:
+            if not self.hedge:
+                return await first
+
+            done, _ = await asyncio.wait({first}, timeout=self.hedge_delay(primary))
+            if done or not self._take_hedge_credit():
+                return await first
+
+            second = asyncio.ensure_future(self._atimed(backup, send, True, failed))
+            self._record_hedge(backup, won=False)
+            pending, results = {first, second}, {}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result is not None and not failed(result):
+                        if task is second:
+                            self._record_hedge(backup, won=True)
+                        return result
+                    results[task] = result
+            return results[first]
+        finally:
+            # asyncio.wait() does not cancel what it waits on; don't leave
+            # upstream calls running (and spending rate budget) for nobody
+            for task in (first, second):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self):
+        """
+        Per-model routing, latency and hedging counters.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "hedge_credit": round(self._hedge_credit, 2),
+                "models": {
+                    model.name: {
+                        "api_url": model.api_url,
+                        "healthy": self._healthy(model, now),
+                        "samples": len(model.latencies),
+                        "ewma_ms": round(model.ewma * 1000, 1) if model.ewma is not None else None,
+                        "p95_ms": round(model.p95() * 1000, 1) if model.latencies else None,
+                        "consecutive_failures": model.consecutive_failures,
+                        "picked": model.picked,
+                        "hedges_fired": model.hedges_fired,
+                        "hedges_won": model.hedges_won,
+                    }
+                    for model in self.models
+                },
+            }
@@ -0,0 +1,159 @@
+# src/mvp/segment.py
+"""
+Sentence segmentation and text normalization shared by chunking, extractive
+ranking, cache keys, paraphrase splitting and the UI word count.
+
+Segmentation is one left-to-right scan with a single precompiled pattern and
+returns (start, end) offsets into the original string; sentence strings are
+only created by callers that ask for them (split_sentences).
+"""
+import re
+
+# Abbreviations that practically never end a sentence ("Dr. Smith", "e.g. Python").
+# Others ("etc.", "Inc.") end one when the next word is capitalized, like any period.
+ABBREVIATIONS = (
+    "mr", "mrs", "ms", "dr", "prof", "rev", "hon", "st", "sr", "jr", "gen", "col", "capt", "lt", "sgt",
+    "e\\.g", "i\\.e", "cf", "vs", "viz", "approx", "fig", "figs", "vol", "pp", "al", "ca",
+)
+
+# Bullet / enumerator at the start of a line: "-", "*", "•", "1.", "2)", "(a)", "b."
+_BULLET = r"(?:[-*•‣◦▪–]|\(?\d{1,3}[.):]|\(?[A-Za-z][.)])[ \t]+"
+
+# Every alternative starts with punctuation or a newline, so the regex engine
+# skips ordinary text in C between candidates
+_SCAN_RE = re.compile(
+    r"""
+    (?P<end>[.!?…]+["'”’»)\]]*)(?=\s+(\S)|\s*$)    # terminal punctuation + closing quotes, then space
+    | \n[ \t]*\n                                    # blank line (paragraph, heading)
+    | \n(?=[ \t]*%s)                                # new bullet / list item
+    """ % _BULLET,
+    re.VERBOSE,
+)
+# Checked only in front of a period: a known abbreviation, a single capital
+# (possible initial) or a line-leading enumerator ("1." in a numbered list)
+_ABBREVIATION_RE = re.compile(r"\b(?:%s)$" % "|".join(ABBREVIATIONS), re.IGNORECASE)
+_ABBREVIATION_SPAN = max(len(a) for a in ABBREVIATIONS) + 1
+_CAPITAL_RE = re.compile(r"\b[A-Z]$")
+_ENUMERATOR_RE = re.compile(r"[ \t]*\(?(?:\d{1,3}|[A-Za-z])$")
+_ENUMERATOR_SPAN = 8
+# Initials: part of a chain ("J. R. Tolkien", "U.S."), or the middle initial
+# of a full name ("President John F. Kennedy": capitalized word before that
+# does not start the sentence)
+_INITIAL_BEFORE_RE = re.compile(r"\b[A-Z]\.\s*$")
+_INITIAL_AFTER_RE = re.compile(r"\s*[A-Z]\.")
+_NAME_BEFORE_RE = re.compile(r"[a-z,;]\s+[A-Z][a-z]+\s+$")
+_BULLET_RE = re.compile(r"^[ \t]*" + _BULLET)
+_LINE_RE = re.compile(r"^[ \t]*(\S.*?)[ \t\r]*$", re.MULTILINE)
+_WORD_RE = re.compile(r"\w+(?:[-'’]\w+)*")
+_CLOSERS = "\"'”’»)]"
+
+
+def sentence_spans(text):
+    """
+    Sentence boundaries as (start, end) offsets, whitespace trimmed.
+
+    A sentence ends at terminal punctuation (plus any closing quotes or
+    brackets) followed by whitespace and a word that is not lowercase, at a
+    blank line, or before a bullet/numbered list item. Decimals ("3.14"),
+    known abbreviations, list enumerators ("1.") and initials ("J. R.",
+    "U.S.", "John F. Kennedy") do not end sentences, and neither does quoted
+    speech that continues ("Stop!" he said.). A lone capital is an initial
+    only in a chain or mid-name, so "So did I." and "Plan B." still end.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        list[tuple[int, int]]: Offsets in document order
+    """
+    spans = []
+    start = 0
+    for match in _SCAN_RE.finditer(text):
+        if match.group("end"):
+            following = match.group(2)
+            if following is not None and following.islower():
+                continue
+            dot = match.start()
+            if text[dot] == "." and _continues(text, dot, following):
+                continue
+            cut = match.end()
+        else:
+            cut = match.start()
+        _add_span(spans, text, start, cut)
+        start = cut
+    _add_span(spans, text, start, len(text))
+    return spans
+
+
+def _continues(text, dot, following):
+    """
+    True if the period at `dot` belongs to an abbreviation, enumerator or initial.
+    """
+    if _ABBREVIATION_RE.search(text, max(dot - _ABBREVIATION_SPAN, 0), dot):
+        return True
+    # Numbered/lettered list item: only an enumerator between line start and the period
+    newline = text.rfind("\n", max(dot - _ENUMERATOR_SPAN, 0), dot)
+    if (newline >= 0 or dot <= _ENUMERATOR_SPAN) and _ENUMERATOR_RE.match(text, newline + 1, dot):
+        return True
+    if not _CAPITAL_RE.search(text, max(dot - 2, 0), dot) or text[dot - 1] == "I":
+        return False
+    if _INITIAL_BEFORE_RE.search(text, max(dot - 8, 0), dot - 1) or _INITIAL_AFTER_RE.match(text, dot + 1):
+        return True
+    return following is not None and following.isupper() and bool(
+        _NAME_BEFORE_RE.search(text, max(dot - 40, 0), dot - 1)
+    )
+
+
+def _add_span(spans, text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if end > start:
+        spans.append((start, end))
+
+
+def split_sentences(text):
+    """
+    Sentences of text as strings (see sentence_spans()).
+    """
+    return [text[start:end] for start, end in sentence_spans(text)]
+
+
+def ends_sentence(text):
+    """
+    True if text ends on terminal punctuation (ignoring closing quotes/brackets).
+    """
+    tail = text.rstrip().rstrip(_CLOSERS)
+    return tail.endswith((".", "!", "?", "…"))
+
+
+def iter_lines(text):
+    """
+    Non-blank lines of text, stripped, in one scan.
+    """
+    for match in _LINE_RE.finditer(text):
+        yield match.group(1)
+
+
+def strip_bullet(line):
+    """
+    Removes a leading bullet or enumerator ("1.", "2)", "-", "•").
+    """
+    return _BULLET_RE.sub("", line, count=1)
+
+
+def normalize_whitespace(text):
+    r"""
+    Collapses every whitespace run (including newlines and NBSP) to one space.
+    Same result as re.sub(r"\s+", " ", text).strip(), about three times faster.
+    """
+    return " ".join(text.split())
+
+
+def count_words(text):
+    """
+    Number of words; punctuation-only tokens ("—", "•") are not counted and
+    hyphenated or contracted words ("state-of-the-art", "don't") count once.
+    """
+    return sum(1 for _ in _WORD_RE.finditer(text))
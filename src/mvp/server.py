@@ -0,0 +1,244 @@
+# src/mvp/server.py
+"""
+HTTP API for ParaGlow: one shared ParaGlowProcessor behind async handlers,
+so other services can call it directly and the Streamlit UI can be scaled
+separately from the backend.
+
+    python -m src.mvp.server --host 0.0.0.0 --port 8000 --workers 2
+
+Endpoints:
+    POST /summarize   {"text": ..., "method": "abstractive", "length": "medium"}
+    POST /paraphrase  {"text": ..., "num_return_sequences": 3}
+    GET  /status      processor status plus admission (backpressure) stats
+    GET  /metrics     Prometheus text format
+
+FastAPI and uvicorn are imported lazily: only the API server needs them.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from . import metrics
+from .cache import is_cacheable, is_unavailable
+
+METHODS = ("abstractive", "extractive")
+LENGTHS = ("short", "medium", "long")
+
+
+def result_status(result):
+    """
+    HTTP status for a processor result: 200 ok, 503 upstream unavailable
+    (loading, circuit open; retry later), 422 input the backend could not
+    handle (e.g. too long), 502 any other upstream failure.
+    """
+    if is_cacheable(result):
+        return 200
+    if is_unavailable(result):
+        return 503
+    return 422 if result.startswith("⚠️") else 502
+
+
+class AdmissionGate:
+    """
+    Backpressure for the API: at most `max_in_flight` requests run at once and
+    up to `max_queue` wait (at most `queue_timeout` seconds) for a slot.
+    Anything beyond that is answered 429 right away instead of piling up
+    behind the upstream rate limits. Used from the event loop only.
+    """
+
+    def __init__(self, max_in_flight=16, max_queue=64, queue_timeout=5.0):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore = None
+
+    async def acquire(self):
+        """
+        Returns True once a slot is held, False if the request should get a 429.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self):
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+        }
+
+
+def create_app(processor=None, config=None):
+    """
+    Builds the FastAPI app around a shared processor (created from config.yaml if not given).
+    """
+    from contextlib import asynccontextmanager
+
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, PlainTextResponse
+
+    if processor is None:
+        from .processor import ParaGlowProcessor
+        processor = ParaGlowProcessor(config)
+    server_config = processor.config.get("server") or {}
+    gate = AdmissionGate(
+        max_in_flight=server_config.get("max_in_flight", 16),
+        max_queue=server_config.get("max_queue", 64),
+        queue_timeout=server_config.get("queue_timeout", 5.0),
+    )
+    max_body_bytes = server_config.get("max_body_bytes", 1048576)
+    max_chars = server_config.get("max_chars", 200000)
+    retry_after = str(server_config.get("retry_after", 1))
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await processor.aclose()
+
+    app = FastAPI(title="ParaGlow API", lifespan=lifespan)
+    app.state.processor = processor
+    app.state.gate = gate
+
+    def reject(endpoint, status_code, reason, message, headers=None):
+        metrics.API_REJECTED.inc(endpoint=endpoint, reason=reason)
+        return JSONResponse({"error": message}, status_code=status_code, headers=headers)
+
+    async def read_payload(request, endpoint):
+        """
+        Returns (payload, None) or (None, error response). The size limit is
+        checked against Content-Length before the body is read.
+        """
+        declared = request.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > max_body_bytes:
+            return None, reject(endpoint, 413, "too_large", f"Request body exceeds {max_body_bytes} bytes.")
+        body = await request.body()
+        if len(body) > max_body_bytes:
+            return None, reject(endpoint, 413, "too_large", f"Request body exceeds {max_body_bytes} bytes.")
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return None, reject(endpoint, 400, "bad_request", "Body must be JSON.")
+        text = payload.get("text") if isinstance(payload, dict) else None
+        if not isinstance(text, str) or not text.strip():
+            return None, reject(endpoint, 400, "bad_request", "'text' must be a non-empty string.")
+        if len(text) > max_chars:
+            return None, reject(endpoint, 413, "too_large", f"'text' exceeds {max_chars} characters.")
+        return payload, None
+
+    async def admit(request, endpoint, handler):
+        """
+        Runs handler(request_id) once the gate grants a slot, else answers 429.
+        """
+        if not await gate.acquire():
+            return reject(endpoint, 429, "saturated", "Server is busy. Please retry shortly.",
+                          headers={"Retry-After": retry_after})
+        # Callers may propagate their own id; capped so it stays a sane log field
+        request_id = request.headers.get("x-request-id", "")[:64] or None
+        try:
+            return await handler(request_id)
+        finally:
+            gate.release()
+
+    def respond(ctx, result, **extra):
+        status_code = result_status(result)
+        body = {"result": result, **extra} if status_code == 200 else {"error": result}
+        body.update(request_id=ctx.request_id, duration_ms=round(ctx.duration_ms, 1))
+        headers = {"X-Request-ID": ctx.request_id}
+        if status_code == 503:
+            headers["Retry-After"] = retry_after
+        return JSONResponse(body, status_code=status_code, headers=headers)
+
+    @app.post("/summarize")
+    async def summarize(request: Request):
+        payload, error = await read_payload(request, "summarize")
+        if error is not None:
+            return error
+        text = payload["text"]
+        method = str(payload.get("method", "abstractive")).lower()
+        length = str(payload.get("length", "medium")).lower()
+        if method not in METHODS or length not in LENGTHS:
+            return reject("summarize", 400, "bad_request", f"method must be one of {METHODS}, length one of {LENGTHS}.")
+
+        async def handler(request_id):
+            ctx = processor.start_trace("summarize", request_id=request_id, method=method, length=length,
+                                        chars=len(text), source="api")
+            result = await processor.asummarize(text, method=method, length=length, ctx=ctx)
+            return respond(ctx, result)
+
+        return await admit(request, "summarize", handler)
+
+    @app.post("/paraphrase")
+    async def paraphrase(request: Request):
+        payload, error = await read_payload(request, "paraphrase")
+        if error is not None:
+            return error
+        text = payload["text"]
+        n = payload.get("num_return_sequences", 3)
+        if not isinstance(n, int) or not 1 <= n <= 10:
+            return reject("paraphrase", 400, "bad_request", "num_return_sequences must be an integer from 1 to 10.")
+
+        async def handler(request_id):
+            ctx = processor.start_trace("paraphrase", request_id=request_id, chars=len(text), source="api")
+            result = await processor.aparaphrase(text, n, ctx=ctx)
+            return respond(ctx, result, variants=result.split("\n\n"))
+
+        return await admit(request, "paraphrase", handler)
+
+    @app.get("/status")
+    async def status():
+        return JSONResponse({**processor.get_status(), "api": gate.stats()})
+
+    @app.get("/metrics")
+    async def prometheus_metrics():
+        return PlainTextResponse(processor.metrics_prometheus(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+
+def main():
+    import uvicorn
+    from src.utils import get_config
+
+    server_config = (get_config() or {}).get("server") or {}
+    parser = argparse.ArgumentParser(description="Serve ParaGlow over HTTP.")
+    parser.add_argument("--host", default=server_config.get("host", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=server_config.get("port", 8000))
+    parser.add_argument("--workers", type=int, default=server_config.get("workers", 1),
+                        help="Worker processes, each with its own processor")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    print(f"🚀 Starting ParaGlow API on http://{args.host}:{args.port} ({args.workers} worker(s))")
+    # Factory import string so every worker process builds its own app and processor
+    uvicorn.run("src.mvp.server:create_app", factory=True, host=args.host, port=args.port, workers=args.workers)
+    print(f"👋 ParaGlow API stopped after {time.perf_counter() - started:.0f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# src/mvp/singleflight.py
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from . import metrics
+
+
+class _LeaderGone(Exception):
+    """
+    Set on a flight whose leader was cancelled; followers re-join the key.
+    """
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller for a key runs
+    the upstream request, everyone else arriving while it is in flight waits
+    for and shares its result. Sync and async callers share the same
+    in-flight table (a concurrent.futures.Future can be awaited from any
+    event loop), so a Streamlit thread and an async caller also coalesce.
+
+    Only the leader's Exceptions are shared. If the leader is cancelled (e.g.
+    an API client disconnects), the key is dropped and a waiting follower
+    runs the call as the new leader instead of inheriting CancelledError.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _join(self, key):
+        """
+        Returns (future, is_leader) for the key.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                metrics.COALESCED.inc()
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _finish(self, key, future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def _abandon(self, key, future):
+        """
+        Drops the key before waking followers, so one of them can lead.
+        """
+        self._finish(key, future)
+        future.set_exception(_LeaderGone())
+
+    def do(self, key, fn):
+        """
+        Runs fn() once per key among concurrent callers and returns its result.
+        """
+        while True:
+            future, is_leader = self._join(key)
+            if is_leader:
+                break
+            try:
+                return future.result()
+            except _LeaderGone:
+                continue
+
+        try:
+            result = fn()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            self._abandon(key, future)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._finish(key, future)
+
+    async def ado(self, key, coro_fn):
+        """
+        Async version of do(); coro_fn() must return an awaitable.
+        """
+        while True:
+            future, is_leader = self._join(key)
+            if is_leader:
+                break
+            try:
+                # shield: a cancelled follower must not cancel the shared future
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderGone:
+                continue
+
+        try:
+            result = await coro_fn()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            self._abandon(key, future)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._finish(key, future)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+            }
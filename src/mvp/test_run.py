@@ -1,35 +1,29 @@
 import os
 import sys
-from dotenv import load_dotenv
 
-# Make sure project root (parent of this folder) is on sys.path so
-# `mvps` can be imported as a package and its relative imports work.
+# Make sure the project root (two levels up) is on sys.path so the
+# `src` package and its relative imports work when run as a script.
 current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(current_dir)
+project_root = os.path.dirname(os.path.dirname(current_dir))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-# Import the pipeline from the local `mvps` package
-from mvps.mvp_pipeline import SummarizationPipeline
+# The old mvps.mvp_pipeline module is gone; ParaGlowProcessor replaced it
+from src.mvp.processor import ParaGlowProcessor
 
-# Load environment variables
-load_dotenv()
+pipeline = ParaGlowProcessor()
 
-api_key = os.getenv("HF_API_KEY")
-
-if not api_key:
+if not os.getenv("HF_API_KEY"):
     print("⚠️ Please set your HF_API_KEY in .env file")
 else:
-    summarizer = SummarizationPipeline(api_key)
-
     text = """Machine learning is a subset of artificial intelligence that enables systems 
     to learn and improve from experience without being explicitly programmed."""
 
     print("=== Abstractive Summary ===")
-    print(summarizer.summarize(text, method='abstractive', length='short'))
+    print(pipeline.summarize(text, method='abstractive', length='short'))
 
     print("\n=== Extractive Summary ===")
-    print(summarizer.summarize(text, method='extractive', length='short'))
+    print(pipeline.summarize(text, method='extractive', length='short'))
 
     print("\n=== Paraphrase ===")
-    print(summarizer.paraphrase(text))
+    print(pipeline.paraphrase(text))
@@ -1,5 +1,12 @@
 # src/mvp/text_extractor.py
+import asyncio
+
 import requests
+from .transport import HTTPTransport, AsyncHTTPTransport
+from .tracing import span
+from .budget import plan_summary
+from .chunker import chunk_text
+from .tokens import model_window
 
 # Renamed class
 class TextExtractor:
@@ -7,42 +14,144 @@ class TextExtractor:
     Pulls the most important sentences from the text to create a summary.
     Uses the Hugging Face API for extractive summarization.
     """
-    def __init__(self, api_key):
+    provider = "huggingface"
+    backend = "extractive"
+
+    def __init__(self, api_key, transport=None, async_transport=None,
+                 base_url="https://api-inference.huggingface.co/models"):
         self.api_key = api_key
         # Using a different model for extractive summarization
-        self.api_url = "https://api-inference.huggingface.co/models/sshleifer/distilbart-cnn-12-6"
+        self.model_name = "sshleifer/distilbart-cnn-12-6"
+        self.api_url = f"{base_url}/{self.model_name}"
+        self.sampling_params = {}
         self.headers = {"Authorization": f"Bearer {api_key}"}
+        # Shared pooled transport (owned by ParaGlowProcessor); standalone use gets its own
+        self.transport = transport or HTTPTransport()
+        self.async_transport = async_transport or AsyncHTTPTransport()
+        # distilbart shares BART's ~1024 token window; keep headroom for special tokens
+        self.max_input_tokens = model_window(self.model_name) - 24
 
-    def summarize(self, text, length='medium'):
+    def summarize(self, text, length='medium', ctx=None, progress=None):
         """
         Generate extractive summary from text.
+        Inputs over the model window are summarized chunk by chunk ('short'
+        preset each) and the pieces joined, instead of failing upstream.
+        progress(done=, total=) is called per chunk when given.
         """
-        length_map = {
-            'short': {"max_length": 60, "min_length": 30},
-            'medium': {"max_length": 130, "min_length": 60},
-            'long': {"max_length": 200, "min_length": 130}
-        }
-        
-        params = length_map.get(length, length_map['medium'])
-        payload = {
-            "inputs": text,
-            "parameters": { **params }
-        }
+        budget = self._plan(text, length, ctx)
+        if budget.action == "passthrough":
+            return text.strip()
+        if budget.action == "chunk":
+            chunks = chunk_text(text, self.max_input_tokens)
+            if progress:
+                progress(total=len(chunks))
+            partials = []
+            for chunk in chunks:
+                partials.append(self._summarize_one(chunk, "short", ctx))
+                if progress:
+                    progress(done=1)
+            return self._join(partials)
+        return self._summarize_one(text, length, ctx, budget)
+
+    def _summarize_one(self, text, length, ctx=None, budget=None):
+        """
+        One upstream call for text that fits the model window.
+        """
+        budget = budget or plan_summary(text, length, self.max_input_tokens)
+        if budget.action == "passthrough":
+            return text.strip()
+        payload = self._build_payload(text, budget)
 
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=60)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    return result[0].get("summary_text", "No summary generated")
-                else:
-                    return str(result)
-            elif response.status_code == 503:
-                return "⚠️ Model is loading. Please try again in a few moments."
-            else:
-                return f"❌ API Error: {response.status_code} - {response.text}"
+            response = self.transport.post(
+                self.api_url, headers=self.headers, json=payload, labels=self._metric_labels(length), ctx=ctx
+            )
+            with span(ctx, "parse"):
+                return self._handle_response(response)
+        except requests.exceptions.Timeout:
+            return "❌ Request timeout. Please try again."
+        except Exception as e:
+            return f"❌ Error: {str(e)}"
+
+    async def asummarize(self, text, length='medium', ctx=None, progress=None):
+        """
+        Async version of summarize(); shares the payload and response handling.
+        """
+        budget = self._plan(text, length, ctx)
+        if budget.action == "passthrough":
+            return text.strip()
+        if budget.action == "chunk":
+            chunks = chunk_text(text, self.max_input_tokens)
+            if progress:
+                progress(total=len(chunks))
+
+            async def run(chunk):
+                partial = await self._asummarize_one(chunk, "short", ctx)
+                if progress:
+                    progress(done=1)
+                return partial
+
+            partials = await asyncio.gather(*(run(chunk) for chunk in chunks))
+            return self._join(partials)
+        return await self._asummarize_one(text, length, ctx, budget)
+
+    async def _asummarize_one(self, text, length, ctx=None, budget=None):
+        budget = budget or plan_summary(text, length, self.max_input_tokens)
+        if budget.action == "passthrough":
+            return text.strip()
+        payload = self._build_payload(text, budget)
+
+        try:
+            response = await self.async_transport.post(
+                self.api_url, self.provider, headers=self.headers, json=payload,
+                labels=self._metric_labels(length), ctx=ctx,
+            )
+            with span(ctx, "parse"):
+                return self._handle_response(response)
         except requests.exceptions.Timeout:
             return "❌ Request timeout. Please try again."
         except Exception as e:
-            return f"❌ Error: {str(e)}"
\ No newline at end of file
+            return f"❌ Error: {str(e)}"
+
+    def _plan(self, text, length, ctx=None):
+        with span(ctx, "budget") as attrs:
+            budget = plan_summary(text, length, self.max_input_tokens)
+            attrs.update(budget.as_dict())
+        return budget
+
+    @staticmethod
+    def _join(partials):
+        """
+        Joins per-chunk summaries, or returns the first error.
+        """
+        for partial in partials:
+            if partial.startswith(("⚠️", "❌")):
+                return partial
+        return " ".join(partials)
+
+    def _metric_labels(self, length):
+        return {"backend": self.backend, "model": self.model_name, "length": length}
+
+    def _build_payload(self, text, budget):
+        """
+        Builds the inference payload with the length preset scaled to the input.
+        """
+        return {
+            "inputs": text,
+            "parameters": { **budget.parameters, **self.sampling_params }
+        }
+
+    def _handle_response(self, response):
+        """
+        Turns an upstream response (requests or httpx) into a summary or error string.
+        """
+        if response.status_code == 200:
+            result = response.json()
+            if isinstance(result, list) and len(result) > 0:
+                return result[0].get("summary_text", "No summary generated")
+            else:
+                return str(result)
+        elif response.status_code == 503:
+            return "⚠️ Model is loading. Please try again in a few moments."
+        else:
+            return f"❌ API Error: {response.status_code} - {response.text}"
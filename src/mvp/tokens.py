@@ -0,0 +1,72 @@
+# src/mvp/tokens.py
+import math
+from functools import lru_cache
+
+# BPE tokenizers (BART, Llama 3) average roughly 1.3 tokens per English word
+TOKENS_PER_WORD = 1.3
+# Lower bound for text with few spaces (URLs, code, tables): ~5 characters per token
+CHARS_PER_TOKEN = 5
+
+# Context windows (tokens) of the models the clients call
+MODEL_WINDOWS = {
+    "facebook/bart-large-cnn": 1024,
+    "sshleifer/distilbart-cnn-12-6": 1024,
+    "llama-3.1-8b-instant": 131072,
+    "llama-3.1-70b-versatile": 131072,
+}
+
+# Longer texts are estimated without the cache so it never pins large documents in memory
+_CACHE_MAX_CHARS = 64 * 1024
+
+
+def _estimate(text):
+    words = len(text.split())
+    return max(math.ceil(words * TOKENS_PER_WORD), math.ceil(len(text) / CHARS_PER_TOKEN)) + 1
+
+
+# The same text is estimated several times per request (budgeting, chunking, rate limiting)
+_estimate_cached = lru_cache(maxsize=4096)(_estimate)
+
+
+def estimate_tokens(text):
+    """
+    Fast local estimate of how many model tokens the text will use (no tokenizer download).
+    Errs on the high side so window checks stay safe.
+    """
+    if len(text) > _CACHE_MAX_CHARS:
+        return _estimate(text)
+    return _estimate_cached(text)
+
+
+def model_window(model_name, default=1024):
+    """
+    Context window of a known model, in tokens.
+    """
+    return MODEL_WINDOWS.get(model_name, default)
+
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    Keeps the leading words of text that fit in max_tokens.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    words = text.split()
+    keep = max(1, int((max_tokens - 1) / TOKENS_PER_WORD))
+    truncated = " ".join(words[:keep])
+    # Long words can still push the character bound over; trim until it fits
+    while keep > 1 and estimate_tokens(truncated) > max_tokens:
+        keep = int(keep * 0.9)
+        truncated = " ".join(words[:keep])
+    if estimate_tokens(truncated) > max_tokens:
+        # A single huge "word" (URL, base64, no spaces at all)
+        truncated = truncated[:(max_tokens - 1) * CHARS_PER_TOKEN]
+    return truncated
+
+
+def cache_info():
+    """
+    Hit/miss counters of the estimator cache.
+    """
+    info = _estimate_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
@@ -0,0 +1,192 @@
+# src/mvp/tracing.py
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+
+# One JSON line per finished request goes to this logger (child of the app logger)
+trace_logger = logging.getLogger("SummarizerAppLogger.trace")
+
+# Trace timestamps are relative to process start so Chrome-trace files line up
+_EPOCH = time.perf_counter()
+
+
+def span(ctx, name, **attrs):
+    """
+    ctx.span(...) when a RequestContext is given, otherwise a no-op context manager.
+    Lets clients take an optional ctx without branching at every call site.
+    """
+    if ctx is None:
+        return nullcontext(attrs)
+    return ctx.span(name, **attrs)
+
+
+class RequestContext:
+    """
+    Per-action trace: a request id plus timing spans (validation, cache lookup,
+    queueing, HTTP send/receive, parsing) recorded by the processor, clients
+    and transport. Spans may be added from worker threads.
+
+    finish() emits one structured JSON log line and, if an exporter is set,
+    appends Chrome-trace events for the request.
+    """
+
+    def __init__(self, operation, request_id=None, enabled=True, exporter=None, **attrs):
+        self.operation = operation
+        self.request_id = request_id or uuid.uuid4().hex[:12]
+        self.enabled = enabled
+        self.exporter = exporter
+        self.attrs = attrs
+
+        self.started = time.perf_counter()
+        self.ended = None
+        self.outcome = None
+        self.thread = threading.current_thread()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """
+        Times the enclosed block. The yielded dict can be filled with extra attributes.
+        """
+        if not self.enabled:
+            yield attrs
+            return
+        start = time.perf_counter()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs["error"] = type(e).__name__
+            raise
+        finally:
+            self.add_span(name, start, time.perf_counter(), **attrs)
+
+    def add_span(self, name, start, end=None, **attrs):
+        """
+        Records a span measured elsewhere (perf_counter seconds).
+        """
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        record = (name, start, end if end is not None else time.perf_counter(), thread.ident, thread.name, attrs)
+        with self._lock:
+            self.spans.append(record)
+
+    def annotate(self, **attrs):
+        """
+        Adds request-level attributes (e.g. coalesced=True, cache='hit').
+        """
+        self.attrs.update(attrs)
+
+    def finish(self, outcome):
+        """
+        Closes the trace and emits it. Later calls are ignored.
+        """
+        with self._lock:
+            if self.ended is not None:
+                return
+            self.ended = time.perf_counter()
+            self.outcome = outcome
+        if not self.enabled:
+            return
+        trace_logger.info(json.dumps(self.to_dict(), default=str))
+        if self.exporter is not None:
+            self.exporter.write(self)
+
+    @property
+    def duration_ms(self):
+        end = self.ended if self.ended is not None else time.perf_counter()
+        return (end - self.started) * 1000
+
+    def to_dict(self):
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "event": "request",
+            "request_id": self.request_id,
+            "operation": self.operation,
+            **self.attrs,
+            "outcome": self.outcome,
+            "duration_ms": round(self.duration_ms, 3),
+            "spans": [
+                {
+                    "name": name,
+                    "start_ms": round((start - self.started) * 1000, 3),
+                    "duration_ms": round((end - start) * 1000, 3),
+                    "thread": thread_name,
+                    **attrs,
+                }
+                for name, start, end, _, thread_name, attrs in sorted(spans, key=lambda s: s[1])
+            ],
+        }
+
+    def chrome_events(self, pid):
+        """
+        Complete ('X') events in the Chrome trace event format, timestamps in µs.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        events = [{
+            "name": self.operation, "cat": "request", "ph": "X", "pid": pid, "tid": self.thread.ident,
+            "ts": (self.started - _EPOCH) * 1e6, "dur": self.duration_ms * 1000,
+            "args": {"request_id": self.request_id, "outcome": self.outcome, **self.attrs},
+        }]
+        for name, start, end, thread_id, _, attrs in spans:
+            events.append({
+                "name": name, "cat": self.operation, "ph": "X", "pid": pid, "tid": thread_id,
+                "ts": (start - _EPOCH) * 1e6, "dur": (end - start) * 1e6,
+                "args": {"request_id": self.request_id, **attrs},
+            })
+        return events
+
+    def thread_names(self):
+        with self._lock:
+            names = {thread_id: thread_name for _, _, _, thread_id, thread_name, _ in self.spans}
+        names[self.thread.ident] = self.thread.name
+        return names
+
+
+class ChromeTraceWriter:
+    """
+    Appends finished requests to a Chrome-trace JSON file (open it in
+    chrome://tracing or ui.perfetto.dev). Uses the streaming "JSON array"
+    form: the closing bracket is optional, so the file is valid to load at
+    any point while the app is running.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pid = os.getpid()
+        self._file = None
+        self._named_threads = set()
+        self._lock = threading.Lock()
+
+    def write(self, ctx):
+        events = ctx.chrome_events(self.pid)
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "w", encoding="utf-8")
+                self._file.write("[\n")
+            for thread_id, thread_name in ctx.thread_names().items():
+                if thread_id not in self._named_threads:
+                    self._named_threads.add(thread_id)
+                    events.append({
+                        "name": "thread_name", "ph": "M", "pid": self.pid, "tid": thread_id,
+                        "args": {"name": thread_name},
+                    })
+            for event in events:
+                self._file.write(json.dumps(event, default=str) + ",\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
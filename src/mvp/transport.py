@@ -0,0 +1,303 @@
+# src/mvp/transport.py
+import asyncio
+import itertools
+import json as jsonlib
+import threading
+import time
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import metrics
+from .tracing import span
+
+
+def _encode(headers, json):
+    """
+    Serializes the payload once so its size can be measured without a second dump.
+    """
+    body = jsonlib.dumps(json).encode("utf-8")
+    return {**(headers or {}), "Content-Type": "application/json"}, body
+
+
+def _record(labels, started, body, response=None, error=None, stream=False):
+    """
+    Records latency, payload sizes and error class for one upstream call.
+    labels: {'backend', 'model', 'length'} supplied by the client.
+    """
+    if not labels:
+        return
+    backend, model = labels.get("backend", ""), labels.get("model", "")
+    metrics.UPSTREAM_LATENCY.observe(
+        time.perf_counter() - started, backend=backend, model=model, length=labels.get("length", "")
+    )
+    metrics.UPSTREAM_REQUEST_BYTES.observe(len(body), backend=backend, model=model)
+    if error is not None:
+        metrics.UPSTREAM_ERRORS.inc(backend=backend, model=model, error_class=metrics.error_class(error))
+        return
+    if response.status_code >= 400:
+        metrics.UPSTREAM_ERRORS.inc(backend=backend, model=model, error_class=f"http_{response.status_code}")
+    if not stream:
+        # Body is already in memory for non-streamed responses
+        metrics.UPSTREAM_RESPONSE_BYTES.observe(len(response.content), backend=backend, model=model)
+
+
+class HTTPTransport:
+    """
+    Shared HTTP layer for all upstream clients (Hugging Face, Groq).
+    Keeps a keep-alive connection pool per upstream host so repeated
+    calls reuse TCP+TLS connections instead of paying a new handshake.
+
+    One instance is owned by ParaGlowProcessor and shared by every
+    Streamlit session using the cached processor. The adapters are mounted
+    once here and never mutated afterwards, and urllib3's pools are
+    thread-safe, so concurrent posts from many script threads are fine.
+    """
+
+    def __init__(self, pool_size=10, max_hosts=10, connect_timeout=5, read_timeout=60, retry_policy=None):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # Optional RetryPolicy shared with the async transport
+        self.retry_policy = retry_policy
+
+        # pool_connections = number of per-host pools kept alive,
+        # pool_maxsize = sockets kept per host. pool_block stays off: requests
+        # gives urllib3 no pool timeout, so a blocking pool would park callers
+        # forever (outside the retry deadline) once chunk/hedge/job workers and
+        # open streams hold every socket. Extra connections just aren't kept.
+        adapter = HTTPAdapter(
+            pool_connections=max_hosts,
+            pool_maxsize=pool_size,
+            pool_block=False,
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @classmethod
+    def from_config(cls, config, retry_policy=None):
+        """
+        Builds a transport from the 'transport' section of config.yaml.
+        """
+        config = config or {}
+        return cls(
+            pool_size=config.get("pool_size", 10),
+            max_hosts=config.get("max_hosts", 10),
+            connect_timeout=config.get("connect_timeout", 5),
+            read_timeout=config.get("read_timeout", 60),
+            retry_policy=retry_policy,
+        )
+
+    def post(self, url, headers=None, json=None, timeout=None, stream=False, labels=None, ctx=None):
+        """
+        Sends a POST request through the pooled session.
+
+        Args:
+            url (str): Upstream endpoint
+            headers (dict): Request headers
+            json (dict): JSON payload
+            timeout (float | tuple): Overrides the default (connect, read) timeout
+            stream (bool): Leave the body unread so it can be consumed incrementally
+            labels (dict): Metric labels (backend, model, length) for this call
+            ctx (RequestContext): Optional trace; gets http_send/http_receive spans per attempt
+
+        Returns:
+            requests.Response
+        """
+        headers, body = _encode(headers, json)
+        started = time.perf_counter()
+        try:
+            response = self._post(url, headers, body, timeout, stream, ctx)
+        except Exception as e:
+            _record(labels, started, body, error=e)
+            raise
+        _record(labels, started, body, response=response, stream=stream)
+        return response
+
+    def _post(self, url, headers, body, timeout, stream, ctx):
+        if self.retry_policy is None:
+            if timeout is None:
+                timeout = (self.connect_timeout, self.read_timeout)
+            return self._send(url, headers, body, timeout, stream, ctx, attempt=0)
+
+        attempts = itertools.count()
+
+        def send(remaining):
+            # Never wait on a read past the policy's total deadline
+            attempt_timeout = timeout or (self.connect_timeout, max(0.1, min(self.read_timeout, remaining)))
+            return self._send(url, headers, body, attempt_timeout, stream, ctx, attempt=next(attempts))
+
+        return self.retry_policy.call(url, send)
+
+    def _send(self, url, headers, body, timeout, stream, ctx, attempt):
+        """
+        One attempt. The body is always requested as a stream so sending (up to the
+        response headers) and receiving the body are timed as separate spans.
+        """
+        with span(ctx, "http_send", url=url, attempt=attempt, bytes=len(body)) as attrs:
+            response = self._session.post(url, headers=headers, data=body, timeout=timeout, stream=True)
+            attrs["status"] = response.status_code
+        if not stream:
+            with span(ctx, "http_receive", url=url, attempt=attempt) as attrs:
+                attrs["bytes"] = len(response.content)
+        return response
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+        self._session.close()
+
+
+class AsyncHTTPTransport:
+    """
+    Async counterpart of HTTPTransport, backed by httpx.AsyncClient.
+    Upstream concurrency is capped by one semaphore per provider
+    ("huggingface", "groq") so a burst of async callers cannot flood
+    an upstream. Clients and semaphores are bound to an event loop,
+    so one set is kept per running loop.
+    """
+
+    def __init__(self, pool_size=10, connect_timeout=5, read_timeout=60, concurrency=None, retry_policy=None):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry_policy = retry_policy
+        # provider name -> max in-flight requests
+        self.concurrency = concurrency or {}
+        self.default_concurrency = pool_size
+
+        self._clients = weakref.WeakKeyDictionary()
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, retry_policy=None):
+        """
+        Builds an async transport from the 'transport' section of config.yaml.
+        """
+        config = config or {}
+        return cls(
+            pool_size=config.get("pool_size", 10),
+            connect_timeout=config.get("connect_timeout", 5),
+            read_timeout=config.get("read_timeout", 60),
+            concurrency=config.get("async_concurrency"),
+            retry_policy=retry_policy,
+        )
+
+    def _client(self):
+        """
+        Returns the httpx client for the running event loop, creating it on first use.
+        """
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                    ),
+                    timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                )
+                self._clients[loop] = client
+            return client
+
+    def _semaphore(self, provider):
+        """
+        Returns the per-provider semaphore for the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            semaphore = semaphores.get(provider)
+            if semaphore is None:
+                limit = self.concurrency.get(provider, self.default_concurrency)
+                semaphore = asyncio.Semaphore(limit)
+                semaphores[provider] = semaphore
+            return semaphore
+
+    async def post(self, url, provider, headers=None, json=None, timeout=None, labels=None, ctx=None):
+        """
+        Sends a POST request, waiting for a free slot in the provider's semaphore.
+
+        Args:
+            url (str): Upstream endpoint
+            provider (str): Concurrency bucket, e.g. 'huggingface' or 'groq'
+            headers (dict): Request headers
+            json (dict): JSON payload
+            timeout (float): Overrides the default read timeout
+            labels (dict): Metric labels (backend, model, length) for this call
+            ctx (RequestContext): Optional trace; gets queue/http_send/http_receive spans
+
+        Returns:
+            httpx.Response (exposes status_code, json() and text like requests.Response)
+        """
+        headers, body = _encode(headers, json)
+        started = time.perf_counter()
+        try:
+            response = await self._post(url, provider, headers, body, timeout, ctx)
+        except Exception as e:
+            _record(labels, started, body, error=e)
+            raise
+        _record(labels, started, body, response=response)
+        return response
+
+    async def _post(self, url, provider, headers, body, timeout, ctx):
+        if self.retry_policy is None:
+            return await self._send(url, provider, headers, body, timeout, ctx, attempt=0)
+
+        attempts = itertools.count()
+
+        async def send(remaining):
+            attempt_timeout = timeout or max(0.1, min(self.read_timeout, remaining))
+            return await self._send(url, provider, headers, body, attempt_timeout, ctx, attempt=next(attempts))
+
+        return await self.retry_policy.acall(url, send)
+
+    async def _send(self, url, provider, headers, body, timeout, ctx, attempt):
+        """
+        One attempt; the provider slot is held only while the request is in flight.
+        """
+        import httpx
+
+        client = self._client()
+        semaphore = self._semaphore(provider)
+        with span(ctx, "queue", kind="provider_slot", provider=provider):
+            await semaphore.acquire()
+        try:
+            request = client.build_request(
+                "POST", url, headers=headers, content=body,
+                **({} if timeout is None else {"timeout": timeout}),
+            )
+            with span(ctx, "http_send", url=url, attempt=attempt, bytes=len(body)) as attrs:
+                response = await client.send(request, stream=True)
+                attrs["status"] = response.status_code
+            try:
+                with span(ctx, "http_receive", url=url, attempt=attempt) as attrs:
+                    attrs["bytes"] = len(await response.aread())
+            finally:
+                await response.aclose()
+            return response
+        except httpx.TimeoutException as e:
+            # Keep one error vocabulary for the clients' sync and async paths
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        finally:
+            semaphore.release()
+
+    async def aclose(self):
+        """
+        Closes the httpx client bound to the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+            self._semaphores.pop(loop, None)
+        if client is not None:
+            await client.aclose()
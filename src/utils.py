@@ -1,6 +1,20 @@
 # src/utils.py
+import hashlib
+import os
+import re
+import threading
+
 import yaml
 
+_assets = {}  # (path, kind) -> (signature, digest, value)
+_env_loaded = False
+_lock = threading.Lock()
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCT_SPACE = re.compile(r"\s*([{};])\s*")
+
+
 def load_config(config_path="config.yaml"):
     """
     Loads the config.yaml file.
@@ -9,10 +23,81 @@ def load_config(config_path="config.yaml"):
         config = yaml.safe_load(file)
     return config
 
+def cached_asset(path, kind, parse):
+    """
+    Returns parse(raw_bytes) for a file, shared process-wide across Streamlit reruns.
+
+    Each call costs one os.stat(); the file is re-read only when its mtime or
+    size changed, and re-parsed only when its content hash changed too.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = (path, kind)
+
+    entry = _assets.get(key)
+    if entry is not None and entry[0] == signature:
+        return entry[2]
+
+    with _lock:
+        entry = _assets.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[2]
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry is not None and entry[1] == digest:
+            # Touched but unchanged: keep the parsed value
+            value = entry[2]
+        else:
+            value = parse(raw)
+        _assets[key] = (signature, digest, value)
+        return value
+
+def get_config(config_path="config.yaml"):
+    """
+    Returns the parsed config, re-parsing only when config.yaml changes.
+    Shared by the logger, the Streamlit app and ParaGlowProcessor.
+    """
+    return cached_asset(config_path, "config", yaml.safe_load)
+
+def load_env():
+    """
+    Loads the .env file once per process (later calls are no-ops).
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
 def load_css(file_path):
     """
     Loads a CSS file and returns it as a string
     to be injected into Streamlit.
     """
     with open(file_path) as f:
-        return f.read()
\ No newline at end of file
+        return f.read()
+
+def minify_css(css):
+    """
+    Drops comments and redundant whitespace to shrink the payload sent per rerun.
+    """
+    css = _CSS_COMMENT.sub("", css)
+    css = _CSS_SPACE.sub(" ", css)
+    return _CSS_PUNCT_SPACE.sub(r"\1", css).strip()
+
+def get_style_tag(file_path):
+    """
+    Returns the minified stylesheet wrapped in a <style> tag, built once and
+    rebuilt only when the file changes. Streamlit drops elements that are not
+    re-emitted on a rerun, so the tag is still sent each run — but without
+    re-reading, re-formatting or re-sending comments and indentation.
+    """
+    return cached_asset(
+        file_path, "style_tag",
+        lambda raw: f"<style>{minify_css(raw.decode('utf-8'))}</style>",
+    )
@@ -0,0 +1,8 @@
+# tests/conftest.py
+import os
+import sys
+
+# Make the project root importable when pytest is run from anywhere
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
@@ -0,0 +1,65 @@
+# tests/test_batch.py
+import io
+import json
+from types import SimpleNamespace
+
+from src.mvp.batch import BatchRunner, Checkpoint, Progress, count_records, iter_records
+
+
+def make_runner(fail=()):
+    def summarize(text, method, length):
+        return "❌ Error: upstream down" if text in fail else text.upper()
+    return BatchRunner(SimpleNamespace(summarize=summarize), concurrency=2)
+
+
+def run(tmp_path, records, fail=(), retry_failed=False, save_interval=2.0):
+    output_path = tmp_path / "out.jsonl"
+    checkpoint = Checkpoint(
+        str(tmp_path / "out.checkpoint.json"), {"input": "test"}, retry_failed,
+        output_path=str(output_path), save_interval=save_interval,
+    ).load()
+    with open(output_path, "a", encoding="utf-8") as output:
+        make_runner(fail).run(records, output, checkpoint, Progress(len(records), stream=io.StringIO()))
+    return checkpoint
+
+
+def rows(tmp_path):
+    with open(tmp_path / "out.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def records(n):
+    return [(index, f"r{index}", f"text {index}", None) for index in range(n)]
+
+
+def test_csv_count_matches_the_rows_read(tmp_path):
+    path = tmp_path / "corpus.csv"
+    path.write_text("id,text\n1,one\n\n2,two\n\n\n3,three\n", encoding="utf-8")
+    assert count_records(str(path)) == len(list(iter_records(str(path)))) == 3
+
+
+def test_checkpoint_is_saved_periodically_not_per_record(tmp_path, monkeypatch):
+    saves = []
+    monkeypatch.setattr(Checkpoint, "save", lambda self, output=None: saves.append(output))
+    run(tmp_path, records(50), fail={f"text {index}" for index in range(0, 50, 2)}, save_interval=60)
+    # Only the final save on exit
+    assert len(saves) == 1
+
+
+def test_rows_written_after_the_last_save_are_not_duplicated(tmp_path):
+    run(tmp_path, records(3))
+    # Crash after writing rows 3 and 4 (and half of 5), before the checkpoint was saved
+    with open(tmp_path / "out.jsonl", "a", encoding="utf-8") as output:
+        output.write(json.dumps({"index": 3, "id": "r3", "attempt": 1, "result": "TEXT 3"}) + "\n")
+        output.write(json.dumps({"index": 4, "id": "r4", "attempt": 1, "error": "❌ Error: down"}) + "\n")
+        output.write('{"index": 5, "id": "r5", "att')
+
+    run(tmp_path, records(6))
+    assert sorted((row["index"], row["attempt"]) for row in rows(tmp_path)) == [
+        (0, 1), (1, 1), (2, 1), (3, 1), (4, 1), (5, 1)
+    ]
+
+    # The replayed failure keeps its attempt count for --retry-failed
+    checkpoint = run(tmp_path, records(6), retry_failed=True)
+    assert [(row["index"], row["attempt"]) for row in rows(tmp_path)][-1] == (4, 2)
+    assert checkpoint.failed == set() and checkpoint.watermark == 6
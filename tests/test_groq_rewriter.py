@@ -0,0 +1,39 @@
+# tests/test_groq_rewriter.py
+import pytest
+
+from src.mvp import tokens
+from src.mvp.groq_rewriter import GroqRewriter
+from src.mvp.rate_limiter import RateLimiter
+from src.mvp.router import ModelEndpoint, ModelRouter
+
+
+class NoNetwork:
+    def post(self, *args, **kwargs):
+        raise AssertionError("request should have been rejected before sending")
+
+
+def test_parse_variants():
+    assert GroqRewriter.parse_variants('{"variants": ["One.", "Two."]}', 3) == ["One.", "Two."]
+    # Valid JSON without variants is an error, not a "variant"
+    for content in ('{"variants": []}', '{}', '{"variants": ["  "]}', '[]'):
+        result = GroqRewriter.parse_variants(content, 3)
+        assert len(result) == 1 and result[0].startswith("❌")
+    # Truncated at max_tokens: the complete strings are kept
+    assert GroqRewriter.parse_variants('{"variants": ["One.", "Two.", "Thr', 3) == ["One.", "Two."]
+    assert GroqRewriter.parse_variants("1. One.\n2. Two.", 3) == ["One.", "Two."]
+
+
+def test_window_is_checked_against_the_routed_model(monkeypatch):
+    monkeypatch.setitem(tokens.MODEL_WINDOWS, "tiny-model", 100)
+    models = [ModelEndpoint("tiny-model", "http://tiny"), ModelEndpoint("llama-3.1-8b-instant", "http://big")]
+    router = ModelRouter(models, hedge=False, explore=0.0)
+    models[0].ewma, models[1].ewma = 0.001, 0.002  # route to the small model
+    limiter = RateLimiter(tokens_per_minute=100000)
+    paraphraser = GroqRewriter(api_key="test", transport=NoNetwork(), rate_limiter=limiter, router=router)
+
+    result = paraphraser.paraphrase("A sentence that is long enough. " * 20, num_return_sequences=3)
+
+    assert len(result) == 1 and result[0].startswith("⚠️") and "tiny-model" in result[0]
+    # Nothing was sent, so the quota was handed back
+    assert limiter.stats()["reconciled_tokens"] < 0
+    assert limiter._tokens.tokens == pytest.approx(limiter._tokens.capacity, rel=0.01)
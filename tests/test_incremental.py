@@ -0,0 +1,47 @@
+# tests/test_incremental.py
+import pytest
+
+from benchmarks.mock_server import LatencyModel, MockUpstreamConfig, start_mock_server
+from benchmarks.run_benchmarks import build_processor
+from src.mvp.processor import ParaGlowProcessor
+
+SENTENCES = [f"Sentence number {i} explains how teams in region {i % 7} review their quarterly numbers." for i in range(400)]
+
+
+@pytest.fixture()
+def upstream():
+    server, base = start_mock_server(MockUpstreamConfig(latency=LatencyModel("fixed", median=0.0)))
+    yield base
+    server.shutdown()
+
+
+def upstream_calls(ctx):
+    return sum(1 for span in ctx.spans if span[0] == "http_send")
+
+
+def test_document_summary_without_incremental_mode(upstream):
+    processor = build_processor(upstream)
+    assert processor.partial_cache is None
+
+    ctx = processor.start_trace("summarize_document")
+    result = processor.summarize_document(" ".join(SENTENCES).encode(), "report.txt", ctx=ctx)
+
+    assert not result.startswith(("⚠️", "❌")), result
+    # Multi-chunk document: map calls plus at least one reduce
+    assert upstream_calls(ctx) > 2
+
+
+def test_edit_only_resends_changed_chunks(upstream):
+    config = dict(build_processor(upstream).config, summarization={"incremental": True})
+    processor = ParaGlowProcessor(config)
+
+    first = processor.start_trace("summarize")
+    processor.summarize(" ".join(SENTENCES), method="abstractive", ctx=first)
+
+    edited = list(SENTENCES)
+    edited[200] = "A completely rewritten sentence about something else entirely."
+    second = processor.start_trace("summarize")
+    result = processor.summarize(" ".join(edited), method="abstractive", ctx=second)
+
+    assert not result.startswith(("⚠️", "❌")), result
+    assert upstream_calls(second) < upstream_calls(first) / 2
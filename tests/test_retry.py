@@ -0,0 +1,145 @@
+# tests/test_retry.py
+import asyncio
+import time
+
+import pytest
+import requests
+
+from src.mvp.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("no body")
+        return self._body
+
+    def close(self):
+        pass
+
+
+def opened_breaker(policy, endpoint="u"):
+    """
+    Breaker for `endpoint`, open with its reset timeout already elapsed.
+    """
+    breaker = policy.breaker_for(endpoint)
+    for _ in range(policy.breaker_threshold):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    breaker.opened_at -= policy.breaker_reset
+    return breaker
+
+
+def make_policy(**kwargs):
+    options = dict(max_attempts=3, base_delay=0, max_delay=0, deadline=10, breaker_threshold=2, breaker_reset=60)
+    options.update(kwargs)
+    return RetryPolicy(**options)
+
+
+def test_breaker_opens_and_trial_success_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    breaker.opened_at -= 60
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one trial at a time
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+
+def test_trial_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.opened_at -= 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+
+def test_silent_trial_is_replaced_after_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+    assert breaker.allow()
+    assert not breaker.accepting()
+    breaker.trial_started -= 60
+    assert breaker.accepting() and breaker.allow()
+
+
+def test_loading_model_during_trial_closes_breaker():
+    policy = make_policy()
+    breaker = opened_breaker(policy)
+    responses = iter([FakeResponse(503, {"error": "loading", "estimated_time": 0.0}), FakeResponse(200)])
+
+    response = policy.call("u", lambda timeout: next(responses))
+    assert response.status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_rate_limiting_does_not_open_breaker():
+    policy = make_policy()
+    breaker = policy.breaker_for("u")
+    sent = []
+
+    def send(timeout):
+        sent.append(True)
+        return FakeResponse(429, headers={"Retry-After": "0"})
+
+    for _ in range(3):
+        assert policy.call("u", send).status_code == 429
+    # Every 429 was retried, but the upstream answered each time
+    assert len(sent) == 3 * policy.max_attempts
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+
+def test_non_retryable_error_during_trial_reopens():
+    policy = make_policy()
+    breaker = opened_breaker(policy)
+
+    def send(timeout):
+        raise requests.exceptions.ChunkedEncodingError("broken body")
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        policy.call("u", send)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_cancelled_trial_is_released():
+    policy = make_policy()
+    breaker = opened_breaker(policy)
+
+    async def run():
+        async def send(timeout):
+            await asyncio.sleep(10)
+
+        task = asyncio.ensure_future(policy.acall("u", send))
+        await asyncio.sleep(0)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert breaker.state == CircuitBreaker.OPEN
+    # The next request becomes the new trial right away
+    assert breaker.allow()
+
+
+def test_open_breaker_rejects_calls():
+    policy = make_policy()
+    breaker = opened_breaker(policy)
+    breaker.opened_at = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        policy.call("u", lambda timeout: FakeResponse(200))
+    assert policy.stats()["u"]["rejected"] == 1
@@ -0,0 +1,107 @@
+# tests/test_router.py
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from src.mvp.retry import CircuitBreaker, RetryPolicy
+from src.mvp.router import ModelEndpoint, ModelRouter
+
+
+def make_router(policy=None):
+    models = [ModelEndpoint("slow", "http://slow"), ModelEndpoint("fast", "http://fast")]
+    router = ModelRouter(
+        models, hedge_delay_default=0.01, explore=0.0,
+        breaker_accepting=(lambda url: policy.breaker_for(url).accepting()) if policy else None,
+    )
+    # Rank "slow" first so it is the primary and gets hedged
+    models[0].ewma, models[1].ewma = 0.001, 0.002
+    return router, models
+
+
+def test_cancelled_hedge_loser_is_not_sampled():
+    policy = RetryPolicy(breaker_threshold=1, breaker_reset=60)
+    router, (slow, fast) = make_router(policy)
+    slow.consecutive_failures = 2
+    # The slow endpoint is half-open-ready: this call is its trial
+    breaker = policy.breaker_for(slow.api_url)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+
+    async def send(model, hedged):
+        async def attempt(timeout):
+            await asyncio.sleep(5 if model is slow else 0.01)
+            return SimpleNamespace(status_code=200, headers={})
+        response = await policy.acall(model.api_url, attempt)
+        return "ok" if response.status_code == 200 else "error"
+
+    result = asyncio.run(router.acall(send, failed=lambda result: result != "ok"))
+
+    assert result == "ok"
+    assert fast.hedges_won == 1
+    # The loser never answered: no latency sample, health untouched
+    assert len(slow.latencies) == 0
+    assert slow.ewma == 0.001
+    assert slow.consecutive_failures == 2
+    # Its breaker trial was released, not left half-open
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.accepting()
+
+
+def test_half_open_endpoint_with_trial_in_flight_is_skipped():
+    policy = RetryPolicy(breaker_threshold=1, breaker_reset=60)
+    router, (slow, fast) = make_router(policy)
+    breaker = policy.breaker_for(slow.api_url)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+    # Open past its timeout: still routable (the next call is the trial)
+    assert router.pick()[0] is slow
+    assert breaker.allow()
+    # Trial in flight: other requests go elsewhere
+    assert router.pick()[0] is fast
+
+
+def test_cancelled_caller_cancels_both_attempts():
+    router, (slow, fast) = make_router()
+    running = []
+
+    async def send(model, hedged):
+        running.append(model)
+        try:
+            await asyncio.sleep(5)
+        finally:
+            running.remove(model)
+        return "ok"
+
+    async def run():
+        caller = asyncio.ensure_future(router.acall(send, failed=lambda result: result != "ok"))
+        await asyncio.sleep(0.1)
+        assert len(running) == 2  # primary plus hedge
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0)
+        return list(running)
+
+    assert asyncio.run(run()) == []
+
+
+def test_time_queued_on_the_pool_does_not_count_toward_the_hedge_delay():
+    router, (slow, fast) = make_router()
+    router.hedge_workers = 2
+    router.hedge_delay_default = 0.2
+    release = threading.Event()
+    # Keep every worker busy so the primary waits in the queue
+    for _ in range(router.hedge_workers):
+        router._get_pool().submit(release.wait)
+    threading.Timer(0.3, release.set).start()
+    calls = []
+
+    def send(model, hedged):
+        calls.append(hedged)
+        time.sleep(0.05)
+        return "ok"
+
+    assert router.call(send, failed=lambda result: result != "ok") == "ok"
+    # Queued ~0.3 s, ran 0.05 s: below the 0.2 s delay, so no hedge
+    assert calls == [False]
+    assert fast.hedges_fired == 0
@@ -0,0 +1,35 @@
+# tests/test_segment.py
+from src.mvp.segment import split_sentences
+
+
+def test_numbered_list_items_keep_their_enumerator():
+    text = "Steps to follow:\n1. Mix the flour.\n2. Bake it."
+    assert split_sentences(text) == ["Steps to follow:", "1. Mix the flour.", "2. Bake it."]
+    assert split_sentences("1. First line.\n  a. Sub item.\n(b) Other.") == [
+        "1. First line.", "a. Sub item.", "(b) Other."
+    ]
+    assert split_sentences("Notes:\n- One.\n- Two.\n\nDone.") == ["Notes:", "- One.", "- Two.", "Done."]
+
+
+def test_single_capitals_end_sentences_unless_initials():
+    assert split_sentences("I went home. So did I. Plan B. Next step.") == [
+        "I went home.", "So did I.", "Plan B.", "Next step."
+    ]
+    assert split_sentences("Mr. X met J. R. Tolkien. Then he left.") == [
+        "Mr. X met J. R. Tolkien.", "Then he left."
+    ]
+    assert split_sentences("The U.S. Army won. We met President John F. Kennedy there.") == [
+        "The U.S. Army won.", "We met President John F. Kennedy there."
+    ]
+    assert split_sentences("Version 2. Then more.") == ["Version 2.", "Then more."]
+
+
+def test_abbreviations_decimals_and_quotes():
+    text = 'Dr. Smith paid $3.50, e.g. for fig. 2. Prices rose in Jan. Then "Stop!" he said. "Go." She went.'
+    assert split_sentences(text) == [
+        "Dr. Smith paid $3.50, e.g. for fig. 2.",
+        "Prices rose in Jan.",
+        'Then "Stop!" he said.',
+        '"Go."',
+        "She went.",
+    ]
@@ -0,0 +1,45 @@
+# tests/test_server.py
+import asyncio
+import threading
+import time
+
+from src.mvp.local_extractor import LocalTextExtractor
+from src.mvp.server import result_status
+
+
+def test_result_status():
+    assert result_status("A summary.") == 200
+    assert result_status("⚠️ Text is too long to paraphrase (~9000 tokens with the reply).") == 422
+    assert result_status("⚠️ Model is loading. Please try again in a few moments.") == 503
+    assert result_status("❌ Error: Upstream http://x is temporarily unavailable (circuit open).") == 503
+    assert result_status("❌ API Error: 500 - boom") == 502
+
+
+def test_local_asummarize_runs_off_the_event_loop():
+    loop_thread = []
+
+    class Probe(LocalTextExtractor):
+        def summarize(self, text, length='medium', ctx=None, progress=None):
+            loop_thread.append(threading.current_thread())
+            time.sleep(0.2)
+            return "done"
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        result = await Probe().asummarize("text")
+        task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(run())
+    assert result == "done"
+    assert loop_thread[0] is not threading.main_thread()
+    # The loop kept running other work while the summary was computed
+    assert ticks >= 5
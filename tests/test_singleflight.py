@@ -0,0 +1,66 @@
+# tests/test_singleflight.py
+import asyncio
+
+import pytest
+
+from src.mvp.singleflight import SingleFlight
+
+
+def test_cancelled_leader_hands_the_call_to_a_follower():
+    flight = SingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(True)
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def run():
+        leader = asyncio.create_task(flight.ado("k", slow))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.ado("k", slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == "done"
+    assert len(calls) == 2
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_cancelled_follower_does_not_affect_the_others():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        leader = asyncio.create_task(flight.ado("k", slow))
+        await asyncio.sleep(0.01)
+        quitter = asyncio.create_task(flight.ado("k", slow))
+        follower = asyncio.create_task(flight.ado("k", slow))
+        await asyncio.sleep(0.01)
+        quitter.cancel()
+        return await asyncio.gather(leader, follower)
+
+    assert asyncio.run(run()) == ["done", "done"]
+
+
+def test_leader_exception_is_shared():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            flight.ado("k", failing), flight.ado("k", failing), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats()["leaders"] == 1
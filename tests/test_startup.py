@@ -0,0 +1,40 @@
+# tests/test_startup.py
+import json
+import os
+import subprocess
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter so modules imported by other tests don't leak in
+PROBE = r"""
+import json, sys
+from benchmarks.run_benchmarks import build_processor
+processor = build_processor("http://127.0.0.1:9")
+status = processor.get_status()
+print("PROBE " + json.dumps({
+    "modules": [name for name in ("requests", "httpx", "numpy") if name in sys.modules],
+    "components": list(processor._components),
+    "status": {name: status[name] for name in ("extractive", "abstractive", "groq_paraphraser", "jobs")},
+}))
+"""
+
+
+def run_probe():
+    output = subprocess.check_output([sys.executable, "-c", PROBE], cwd=project_root, text=True)
+    line = next(line for line in output.splitlines() if line.startswith("PROBE "))
+    return json.loads(line[len("PROBE "):])
+
+
+def test_init_and_status_stay_lazy():
+    probe = run_probe()
+    # No HTTP client or numeric library is imported before the first request
+    assert probe["modules"] == []
+    # get_status() reports components without building them
+    assert probe["components"] == []
+    assert probe["status"] == {
+        "extractive": "not_loaded",
+        "abstractive": "not_loaded",
+        "groq_paraphraser": "not_loaded",
+        "jobs": None,
+    }
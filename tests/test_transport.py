@@ -0,0 +1,24 @@
+# tests/test_transport.py
+import threading
+
+from benchmarks.mock_server import LatencyModel, MockUpstreamConfig, start_mock_server
+from src.mvp.transport import HTTPTransport
+
+
+def test_busy_pool_does_not_block_new_callers():
+    server, base = start_mock_server(MockUpstreamConfig(latency=LatencyModel("fixed", median=0.0)))
+    transport = HTTPTransport(pool_size=1, read_timeout=5)
+    url = f"{base}/models/test"
+    payload = {"inputs": "Some text to summarize."}
+    try:
+        # An open stream holds the only pooled connection to the host
+        held = transport.post(url, json=payload, stream=True)
+        responses = []
+        caller = threading.Thread(target=lambda: responses.append(transport.post(url, json=payload)), daemon=True)
+        caller.start()
+        caller.join(timeout=5)
+        assert not caller.is_alive()
+        assert responses[0].status_code == 200
+        held.close()
+    finally:
+        server.shutdown()